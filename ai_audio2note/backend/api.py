@@ -6,12 +6,22 @@ from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 from typing import Optional, List
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import logging
+import logging.handlers
+import queue
 import uvicorn
 import os
+import sys
 
 from .services.audio_downloader import AudioDownloader
 from .services.process_service import ProcessService
 
+logger = logging.getLogger(__name__)
+
 # 创建FastAPI应用
 app = FastAPI(
     title="AI Audio2Note API",
@@ -31,6 +41,45 @@ app.add_middleware(
 # 初始化服务
 process_service = ProcessService()
 
+# 下载任务线程池：下载与转码均为阻塞操作，放到线程池中执行，避免阻塞事件循环
+MAX_CONCURRENT_DOWNLOADS = int(os.environ.get("AI_A2N_MAX_DOWNLOADS", "4"))
+_executor = ThreadPoolExecutor(max_workers=MAX_CONCURRENT_DOWNLOADS)
+
+# 日志：请求路径只负责入队，格式化输出由后台线程完成
+_log_listener: Optional[logging.handlers.QueueListener] = None
+
+
+@app.on_event("startup")
+async def start_log_listener():
+    global _log_listener
+    if _log_listener is not None:
+        return
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler()
+    stream_handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s %(name)s: %(message)s"))
+    root_logger = logging.getLogger()
+    root_logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    root_logger.setLevel(logging.INFO)
+    _log_listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _log_listener.start()
+
+
+@app.on_event("shutdown")
+async def stop_log_listener():
+    global _log_listener
+    if _log_listener is not None:
+        _log_listener.stop()
+        _log_listener = None
+
+
+@app.on_event("shutdown")
+async def close_process_service():
+    process_service.close()
+
+
+# 单个批量请求内同时下载的分P数量
+BATCH_CONCURRENCY = 4
+
 # Pydantic模型
 class VideoProcessRequest(BaseModel):
     url: str
@@ -44,6 +93,39 @@ class VideoProcessResponse(BaseModel):
     video_title: Optional[str] = None
     error: Optional[str] = None
 
+class VideoBatchProcessRequest(BaseModel):
+    url: str
+    pages: List[int]
+    download_dir: Optional[str] = None
+
+class VideoBatchProcessResponse(BaseModel):
+    success: bool
+    results: List[VideoProcessResponse]
+
+# 服务选择
+def _get_service(download_dir: Optional[str]) -> ProcessService:
+    """根据请求的下载目录返回对应的服务实例"""
+    # 如果指定了下载目录，创建新的服务实例
+    if download_dir:
+        logger.info("使用自定义下载目录: %s", download_dir)
+        # 确保目录存在（已存在时直接跳过，无需先检查）
+        try:
+            Path(download_dir).mkdir(parents=True, exist_ok=True)
+        except Exception as e:
+            logger.warning("目录创建失败: %s", e)
+            raise HTTPException(status_code=400, detail=f"无法创建下载目录: {str(e)}")
+
+        return ProcessService(download_dir)
+
+    logger.info("使用默认下载目录")
+    return process_service
+
+
+def _release_service(service: ProcessService) -> None:
+    """关闭按请求创建的服务实例，默认服务在进程退出时统一关闭"""
+    if service is not process_service:
+        service.close()
+
 # API路由
 @app.get("/")
 async def root():
@@ -58,52 +140,89 @@ async def process_video(request: VideoProcessRequest):
     """
     视频下载接口：接收视频 URL，调用服务层进行下载
     """
-    print(f"收到视频处理请求: {request.url}")
+    logger.info("收到视频处理请求: %s", request.url)
     
     if not request.url or len(request.url.strip()) < 10:
-        print("URL验证失败")
+        logger.warning("URL验证失败")
         raise HTTPException(status_code=400, detail="Invalid URL")
     
     try:
-        print("开始处理视频...")
-        print(f"请求参数: url={request.url}, page_number={request.page_number}, download_dir={request.download_dir}")
-        
-        # 如果指定了下载目录，创建新的服务实例
-        if request.download_dir:
-            print(f"使用自定义下载目录: {request.download_dir}")
-            # 验证目录是否存在且可写
-            if not os.path.exists(request.download_dir):
-                print(f"目录不存在，尝试创建: {request.download_dir}")
-                try:
-                    os.makedirs(request.download_dir, exist_ok=True)
-                    print("目录创建成功")
-                except Exception as e:
-                    print(f"目录创建失败: {e}")
-                    raise HTTPException(status_code=400, detail=f"无法创建下载目录: {str(e)}")
-            
-            service = ProcessService(request.download_dir)
-        else:
-            print("使用默认下载目录")
-            service = process_service
-            
-        result = service.process_video(
-            url=request.url, 
-            page_number=request.page_number
+        logger.info("开始处理视频...")
+        logger.info(
+            "请求参数: url=%s, page_number=%s, download_dir=%s",
+            request.url, request.page_number, request.download_dir,
         )
-        print(f"处理结果: {result}")
+        
+        service = _get_service(request.download_dir)
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(
+                _executor,
+                functools.partial(
+                    service.process_video,
+                    url=request.url,
+                    page_number=request.page_number,
+                ),
+            )
+        finally:
+            _release_service(service)
+        logger.info("处理结果: %s", result)
         
         if result.get("success"):
             return VideoProcessResponse(**result)
         else:
             error_msg = result.get("error", "Unknown error")
-            print(f"处理失败: {error_msg}")
+            logger.warning("处理失败: %s", error_msg)
             raise HTTPException(status_code=500, detail=error_msg)
     
     except HTTPException:
         raise
     except Exception as e:
-        print(f"处理异常: {str(e)}")
+        logger.error("处理异常: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
+@app.post("/api/process/video/batch", response_model=VideoBatchProcessResponse)
+async def process_video_batch(request: VideoBatchProcessRequest):
+    """
+    批量分P下载接口：并发下载同一视频的多个分P
+    """
+    logger.info("收到批量处理请求: %s, pages=%s", request.url, request.pages)
+
+    if not request.url or len(request.url.strip()) < 10:
+        logger.warning("URL验证失败")
+        raise HTTPException(status_code=400, detail="Invalid URL")
+    if not request.pages:
+        raise HTTPException(status_code=400, detail="pages 不能为空")
+
+    service = _get_service(request.download_dir)
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(BATCH_CONCURRENCY)
+
+    async def run_page(page: int) -> dict:
+        async with semaphore:
+            return await loop.run_in_executor(
+                _executor,
+                functools.partial(service.process_video, url=request.url, page_number=page),
+            )
+
+    try:
+        results = await asyncio.gather(*(run_page(page) for page in request.pages))
+    finally:
+        _release_service(service)
+    logger.info("批量处理完成: %s 个分P", len(results))
+
+    return VideoBatchProcessResponse(
+        success=all(result.get("success") for result in results),
+        results=[VideoProcessResponse(**result) for result in results],
+    )
+
 if __name__ == "__main__":
-    uvicorn.run(app, host="0.0.0.0", port=8001)
+    # uvloop 不支持 Windows，该平台回退到默认 asyncio 事件循环
+    uvicorn.run(
+        app,
+        host="0.0.0.0",
+        port=8001,
+        loop="asyncio" if sys.platform == "win32" else "uvloop",
+        http="httptools",
+    )
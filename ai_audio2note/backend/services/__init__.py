@@ -2,6 +2,14 @@
 
 from .process_service import ProcessService
 from .transcription_service import TranscriptionService
-from .chat_service import ChatService, ChatMessage, LLMError
+from .chat_service import ChatService, ChatMessage, LLMError, TokenBucket, estimate_tokens
 
-__all__ = ["ProcessService", "TranscriptionService", "ChatService", "ChatMessage", "LLMError"]
+__all__ = [
+    "ProcessService",
+    "TranscriptionService",
+    "ChatService",
+    "ChatMessage",
+    "LLMError",
+    "TokenBucket",
+    "estimate_tokens",
+]
@@ -15,15 +15,53 @@
 版本：1.0.0
 """
 
+import functools
+import logging
 import os
+import re
 import shutil
 import sys
+import threading
 from pathlib import Path
 from typing import Optional
 
 import yt_dlp
 
+logger = logging.getLogger(__name__)
+
+# 支持的视频链接（B站 / YouTube），合并为单个预编译正则
+_SUPPORTED_URL_RE = re.compile(
+    r'https?://(?:'
+    r'(?:www\.)?bilibili\.com/(?:video|bangumi/play|cheese/play)/[A-Za-z0-9]+'
+    r'|(?:www\.|m\.)?youtube\.com/watch\?v=[A-Za-z0-9_-]+'
+    r'|(?:www\.)?youtube\.com/(?:embed|v|shorts)/[A-Za-z0-9_-]+'
+    r'|youtu\.be/[A-Za-z0-9_-]+'
+    r')'
+)
+
+# 快速预筛：正则可能匹配的全部协议+主机前缀
+_SUPPORTED_URL_PREFIXES = tuple(
+    f'{scheme}://{host}/'
+    for scheme in ('http', 'https')
+    for host in (
+        'bilibili.com', 'www.bilibili.com',
+        'youtube.com', 'www.youtube.com', 'm.youtube.com',
+        'youtu.be',
+    )
+)
+
+# URL 主机名及各平台追踪参数（参数名须完整匹配，值截止到 & 或 #）
+_HOST_RE = re.compile(r'[A-Za-z][A-Za-z0-9+.-]*://([^/?#]+)')
+_BILIBILI_TRACKING_RE = re.compile(
+    r'(?<=[?&])(?:spm_id_from|vd_source|unique_k|spm_id|from_spmid|from)=[^&#]*(?:&|(?=#)|$)'
+)
+_YOUTUBE_TRACKING_RE = re.compile(
+    r'(?<=[?&])(?:feature|utm_source|utm_medium|utm_campaign|utm_content|utm_term)=[^&#]*(?:&|(?=#)|$)'
+)
+_DANGLING_SEPARATOR_RE = re.compile(r'[?&]+(?=#|$)')
 
+
+@functools.lru_cache(maxsize=1)
 def _find_ffmpeg() -> Optional[str]:
     """Locate ffmpeg binary across common installation paths."""
     candidates: list[Optional[str]] = []
@@ -58,6 +96,21 @@ def _find_ffmpeg() -> Optional[str]:
     return None
 
 
+_ffmpeg_on_path = False
+
+
+def _ensure_ffmpeg_on_path(ffmpeg_path: str) -> None:
+    """Prepend the ffmpeg directory to PATH once per process."""
+    global _ffmpeg_on_path
+    if _ffmpeg_on_path:
+        return
+    ffmpeg_dir = str(Path(ffmpeg_path).parent)
+    current_path = os.environ.get("PATH", "")
+    if ffmpeg_dir not in current_path.split(os.pathsep):
+        os.environ["PATH"] = os.pathsep.join([ffmpeg_dir, current_path])
+    _ffmpeg_on_path = True
+
+
 class AudioDownloader:
     """
     视记音频下载器类
@@ -66,7 +119,7 @@ class AudioDownloader:
     提供分P选择、URL验证、错误处理等功能
     """
 
-    def __init__(self, session_folder: str | None = None):
+    def __init__(self, session_folder: str | None = None, concurrent_fragments: int = 8):
         """
         初始化视记音频下载器
 
@@ -75,6 +128,7 @@ class AudioDownloader:
 
         Args:
             session_folder (str, optional): 会话文件夹路径
+            concurrent_fragments (int): DASH/HLS 分片并发下载数（1-16）
         """
         # 设置输出目录
         if session_folder:
@@ -85,15 +139,11 @@ class AudioDownloader:
             self.output_dir = self.temp_dir
 
         # 确保输出目录存在
-        if not os.path.exists(self.output_dir):
-            os.makedirs(self.output_dir, exist_ok=True)
+        Path(self.output_dir).mkdir(parents=True, exist_ok=True)
 
         ffmpeg_path = _find_ffmpeg()
         if ffmpeg_path:
-            ffmpeg_dir = str(Path(ffmpeg_path).parent)
-            current_path = os.environ.get("PATH", "")
-            if ffmpeg_dir not in current_path.split(os.pathsep):
-                os.environ["PATH"] = os.pathsep.join([ffmpeg_dir, current_path])
+            _ensure_ffmpeg_on_path(ffmpeg_path)
 
         self.ydl_opts = {
             # 输出目录：保存到指定文件夹
@@ -106,12 +156,28 @@ class AudioDownloader:
             'postprocessors': [{
                 'key': 'FFmpegExtractAudio',  # 使用 FFmpeg 提取音频
                 'preferredcodec': 'mp3',  # 音频编码格式为 MP3
-                'preferredquality': '192',  # 音频质量 192 kbps
+                'preferredquality': '4',  # VBR -q:a 4（约 128 kbps 平均码率）
             }],
 
             # 添加超时设置
             'socket_timeout': 30,
             'retries': 3,
+
+            # 分片并发下载（DASH/HLS），限制上限避免被站点限流
+            'concurrent_fragment_downloads': max(1, min(concurrent_fragments, 16)),
+            'http_chunk_size': 10 * 1024 * 1024,
+
+            # 仅需音频：关闭字幕、缩略图、信息文件等额外请求
+            'writesubtitles': False,
+            'writeautomaticsub': False,
+            'writethumbnail': False,
+            'writeinfojson': False,
+            'getcomments': False,
+            # YouTube：跳过 HLS 清单和翻译字幕的解析（音频格式均来自 DASH/https）
+            'extractor_args': {'youtube': {'skip': ['hls', 'translated_subs']}},
+
+            # 增大下载写缓冲（默认 1KB 起步自适应），减少写文件时的系统调用次数
+            'buffersize': 1024 * 1024,
         }
 
         if ffmpeg_path:
@@ -122,20 +188,47 @@ class AudioDownloader:
                 "或设置环境变量 FFMPEG_PATH 指向可执行文件。"
             )
 
-    def download_audio(self, url: str, page_number: Optional[int] = None) -> bool:
+        # 每个线程复用一个 YoutubeDL 实例，避免每次请求重新初始化提取器和 cookiejar
+        self._local = threading.local()
+        self._instances: list = []
+        self._instances_lock = threading.Lock()
+
+    def _get_ydl(self) -> yt_dlp.YoutubeDL:
+        """返回当前线程复用的 YoutubeDL 实例"""
+        ydl = getattr(self._local, "ydl", None)
+        if ydl is None:
+            ydl = yt_dlp.YoutubeDL(self.ydl_opts.copy())
+            self._local.ydl = ydl
+            with self._instances_lock:
+                self._instances.append(ydl)
+        return ydl
+
+    def close(self) -> None:
+        """关闭各线程创建的 YoutubeDL 实例，释放其网络连接和 cookie 等资源"""
+        with self._instances_lock:
+            instances, self._instances = self._instances, []
+        self._local = threading.local()
+        for ydl in instances:
+            ydl.close()
+
+    def download_audio_with_info(
+        self,
+        url: str,
+        page_number: Optional[int] = None,
+        output_dir: Optional[str] = None,
+    ) -> dict:
         """
-        下载视频并提取为 MP3 音频文件
+        下载视频并提取为 MP3 音频文件，同时返回视频信息
+
+        视频信息与下载在同一次 extract_info 调用中完成，避免重复请求站点。
 
         Args:
             url (str): 视频 URL 地址
-                - B站: https://www.bilibili.com/video/...
-                - YouTube: https://www.youtube.com/watch?v=...
-            page_number (int, optional): 分P编号（从1开始）
-                - None: 下载所有分P
-                - 数字: 下载指定分P
+            page_number (int, optional): 分P编号（从1开始），None 表示下载所有分P
+            output_dir (str, optional): 本次下载的输出目录，默认使用初始化时的目录
 
         Returns:
-            bool: 下载成功返回 True，失败返回 False
+            dict: yt-dlp 返回的视频信息（包含 title 等字段）
         """
         # 验证 URL 是否支持
         if not self._is_supported_url(url):
@@ -143,32 +236,27 @@ class AudioDownloader:
                 "不支持的平台。目前仅支持 B站(bilibili.com) 和 YouTube(youtube.com/ youtu.be) 链接。"
             )
 
-        # 复制配置选项
-        ydl_opts = self.ydl_opts.copy()
-
-        # 如果指定了分P编号，则只下载该分P
-        if page_number is not None:
-            ydl_opts['playlist_items'] = f'{page_number}:{page_number}'
-
         try:
             # 清理URL，移除不必要的参数
             clean_url = self._clean_url(url)
-            print(f"🎵 开始下载音频: {clean_url}")
-            print("📥 正在获取视频信息...")
+            logger.info("🎵 开始下载音频: %s", clean_url)
 
-            # 创建 yt-dlp 下载器实例
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                print("🔍 正在提取视频信息...")
-                # 先获取视频信息，不直接下载
-                info = ydl.extract_info(clean_url, download=False)
-                print(f"📋 视频信息: {info.get('title', 'Unknown')}")
-                
-                print("📥 开始下载...")
-                # 执行下载
-                ydl.download([clean_url])
+            ydl = self._get_ydl()
+            # 如果指定了分P编号，则只下载该分P
+            ydl.params['playlist_items'] = (
+                f'{page_number}:{page_number}' if page_number is not None else None
+            )
+            # 只替换默认模板，保留 yt-dlp 规范化后的其余分类模板
+            ydl.params['outtmpl']['default'] = os.path.join(
+                output_dir or self.output_dir, '%(title)s.%(ext)s'
+            )
 
-                print("✅ 音频下载完成！")
-                return True
+            logger.info("📥 正在获取视频信息并下载...")
+            info = ydl.extract_info(clean_url, download=True)
+            logger.info("📋 视频信息: %s", info.get('title', 'Unknown'))
+
+            logger.info("✅ 音频下载完成！")
+            return info
 
         except Exception as e:
             raise RuntimeError(
@@ -188,7 +276,7 @@ class AudioDownloader:
         try:
             # 清理URL，移除不必要的参数
             clean_url = self._clean_url(url)
-            print(f"清理后的URL: {clean_url}")
+            logger.info("清理后的URL: %s", clean_url)
 
             with yt_dlp.YoutubeDL({'quiet': True}) as ydl:
                 info = ydl.extract_info(clean_url, download=False)
@@ -206,44 +294,21 @@ class AudioDownloader:
         Returns:
             str: 清理后的URL
         """
-        import urllib.parse
-        
-        # 解析URL
-        parsed = urllib.parse.urlparse(url)
-        
-        # 对于B站链接，只移除追踪参数，保留必要的参数
-        if 'bilibili.com' in parsed.netloc:
-            query_params = urllib.parse.parse_qs(parsed.query)
-            # 只移除追踪和统计相关的参数，保留p（分P）、t（时间戳）等重要参数
-            tracking_params = ['spm_id_from', 'vd_source', 'unique_k', 'spm_id', 'from_spmid', 'from']
-            for param in tracking_params:
-                query_params.pop(param, None)
-            
-            # 重新构建URL
-            new_query = urllib.parse.urlencode(query_params, doseq=True)
-            clean_url = urllib.parse.urlunparse((
-                parsed.scheme, parsed.netloc, parsed.path,
-                parsed.params, new_query, parsed.fragment
-            ))
-            return clean_url
-        
-        # 对于YouTube链接，也进行适当的清理
-        elif 'youtube.com' in parsed.netloc or 'youtu.be' in parsed.netloc:
-            query_params = urllib.parse.parse_qs(parsed.query)
-            # 移除追踪参数，保留v（视频ID）等重要参数
-            tracking_params = ['feature', 'utm_source', 'utm_medium', 'utm_campaign', 'utm_content', 'utm_term']
-            for param in tracking_params:
-                query_params.pop(param, None)
-            
-            # 重新构建URL
-            new_query = urllib.parse.urlencode(query_params, doseq=True)
-            clean_url = urllib.parse.urlunparse((
-                parsed.scheme, parsed.netloc, parsed.path,
-                parsed.params, new_query, parsed.fragment
-            ))
-            return clean_url
-        
-        return url
+        host_match = _HOST_RE.match(url)
+        host = host_match.group(1).lower() if host_match else ''
+
+        # 对于B站链接，只移除追踪参数，保留p（分P）、t（时间戳）等重要参数
+        if 'bilibili.com' in host:
+            tracking_re = _BILIBILI_TRACKING_RE
+        # 对于YouTube链接，移除追踪参数，保留v（视频ID）等重要参数
+        elif 'youtube.com' in host or 'youtu.be' in host:
+            tracking_re = _YOUTUBE_TRACKING_RE
+        else:
+            return url
+
+        cleaned = tracking_re.sub('', url)
+        # 去掉移除参数后残留的 ? 或 &
+        return _DANGLING_SEPARATOR_RE.sub('', cleaned)
 
     def _is_supported_url(self, url: str) -> bool:
         """
@@ -255,34 +320,7 @@ class AudioDownloader:
         Returns:
             bool: 支持返回 True，不支持返回 False
         """
-        import re
-        
-        # 更精确的URL模式匹配
-        bilibili_patterns = [
-            r'https?://(?:www\.)?bilibili\.com/video/[A-Za-z0-9]+',
-            r'https?://(?:www\.)?bilibili\.com/bangumi/play/[A-Za-z0-9]+',
-            r'https?://(?:www\.)?bilibili\.com/cheese/play/[A-Za-z0-9]+'
-        ]
-        
-        youtube_patterns = [
-            r'https?://(?:www\.)?youtube\.com/watch\?v=[A-Za-z0-9_-]+',
-            r'https?://(?:www\.)?youtube\.com/embed/[A-Za-z0-9_-]+',
-            r'https?://(?:www\.)?youtube\.com/v/[A-Za-z0-9_-]+',
-            r'https?://youtu\.be/[A-Za-z0-9_-]+',
-            r'https?://(?:www\.)?youtube\.com/shorts/[A-Za-z0-9_-]+',
-            r'https?://(?:m\.)?youtube\.com/watch\?v=[A-Za-z0-9_-]+'
-        ]
-        
         url_lower = url.lower().strip()
-        
-        # 检查B站链接
-        for pattern in bilibili_patterns:
-            if re.match(pattern, url_lower):
-                return True
-        
-        # 检查YouTube链接
-        for pattern in youtube_patterns:
-            if re.match(pattern, url_lower):
-                return True
-        
-        return False
+        if not url_lower.startswith(_SUPPORTED_URL_PREFIXES):
+            return False
+        return _SUPPORTED_URL_RE.match(url_lower) is not None
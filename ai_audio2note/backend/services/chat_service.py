@@ -2,16 +2,51 @@
 
 from __future__ import annotations
 
+import functools
 import json
+import threading
+import time
 from dataclasses import dataclass
-from typing import Optional
+from typing import Iterator, Optional
 
 import requests
+from requests.adapters import HTTPAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+
+def _dumps(obj: object) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _loads(data: bytes | str) -> object:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
 
 
 class LLMError(RuntimeError):
     """Raised when the LLM service returns an error."""
 
+    def __init__(self, message: str, status_code: Optional[int] = None, retryable: bool = False):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retryable = retryable
+
+
+def _http_error(response: requests.Response) -> LLMError:
+    status = response.status_code
+    return LLMError(
+        f"调用大模型失败: HTTP {status} - {response.text}",
+        status_code=status,
+        retryable=status == 429 or status >= 500,
+    )
+
 
 @dataclass
 class ChatMessage:
@@ -19,6 +54,58 @@ class ChatMessage:
     content: str
 
 
+class TokenBucket:
+    """Thread-safe token bucket used to stay under per-minute API quotas."""
+
+    def __init__(self, capacity: float, refill_per_sec: float):
+        self.capacity = float(capacity)
+        self.refill_per_sec = float(refill_per_sec)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._cond = threading.Condition()
+
+    @classmethod
+    def per_minute(cls, limit: float) -> "TokenBucket":
+        return cls(capacity=limit, refill_per_sec=limit / 60.0)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.refill_per_sec)
+        self._updated = now
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until ``tokens`` are available, then consume them."""
+        tokens = min(float(tokens), self.capacity)
+        with self._cond:
+            while True:
+                self._refill()
+                if self._tokens >= tokens:
+                    self._tokens -= tokens
+                    return
+                self._cond.wait((tokens - self._tokens) / self.refill_per_sec)
+
+
+@functools.lru_cache(maxsize=1)
+def _get_encoding():
+    try:
+        import tiktoken
+    except ImportError:  # optional, falls back to a heuristic
+        return None
+    try:
+        return tiktoken.get_encoding("cl100k_base")
+    except Exception:  # noqa: BLE001 - the BPE file may be unavailable offline
+        return None
+
+
+def estimate_tokens(text: str) -> int:
+    """Token count via tiktoken when installed, otherwise a rough CJK/ASCII heuristic."""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=())) + 1
+    ascii_chars = sum(1 for ch in text if ch.isascii())
+    return (len(text) - ascii_chars) + ascii_chars // 4 + 1
+
+
 class ChatService:
     """Simple REST client for DeepSeek style chat completions."""
 
@@ -31,8 +118,20 @@ class ChatService:
         self.base_url = base_url or self.DEFAULT_ENDPOINT
         self.model = model
 
-    def chat(self, history: list[ChatMessage], user_message: str, temperature: float = 0.7) -> str:
-        payload = {
+        # 复用连接：同一主机的多轮请求共享 TCP/TLS 连接
+        self._session = requests.Session()
+        self._session.headers.update(
+            {
+                "Authorization": f"Bearer {api_key}",
+                "Content-Type": "application/json",
+            }
+        )
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=16)
+        self._session.mount("https://", adapter)
+        self._session.mount("http://", adapter)
+
+    def _build_payload(self, history: list[ChatMessage], user_message: str, temperature: float) -> dict:
+        return {
             "model": self.model,
             "messages": [
                 {"role": msg.role, "content": msg.content}
@@ -41,21 +140,55 @@ class ChatService:
             "temperature": temperature,
         }
 
-        headers = {
-            "Authorization": f"Bearer {self.api_key}",
-            "Content-Type": "application/json",
-        }
+    def chat(self, history: list[ChatMessage], user_message: str, temperature: float = 0.7) -> str:
+        payload = self._build_payload(history, user_message, temperature)
 
-        response = requests.post(self.base_url, headers=headers, data=json.dumps(payload), timeout=60)
+        try:
+            response = self._session.post(self.base_url, data=_dumps(payload), timeout=60)
+        except requests.RequestException as exc:
+            raise LLMError(f"调用大模型失败: {exc}", retryable=True) from exc
         if response.status_code != 200:
-            raise LLMError(f"调用大模型失败: HTTP {response.status_code} - {response.text}")
+            raise _http_error(response)
 
-        data = response.json()
         try:
+            data = _loads(response.content)
             return data["choices"][0]["message"]["content"].strip()
-        except (KeyError, IndexError) as exc:  # pragma: no cover - API contract
-            raise LLMError(f"解析大模型响应失败: {data}") from exc
+        except (ValueError, KeyError, IndexError, TypeError, AttributeError) as exc:
+            # 网关返回 HTML 或响应被截断时同样视为可重试的临时错误
+            raise LLMError(
+                f"解析大模型响应失败: {response.text[:500]}", retryable=True
+            ) from exc
+
+    def stream_chat(
+        self, history: list[ChatMessage], user_message: str, temperature: float = 0.7
+    ) -> Iterator[str]:
+        """Yield reply fragments as they arrive via server-sent events."""
+        payload = self._build_payload(history, user_message, temperature)
+        payload["stream"] = True
 
-
-__all__ = ["ChatService", "ChatMessage", "LLMError"]
+        try:
+            response = self._session.post(self.base_url, data=_dumps(payload), timeout=60, stream=True)
+        except requests.RequestException as exc:
+            raise LLMError(f"调用大模型失败: {exc}", retryable=True) from exc
+
+        with response:
+            if response.status_code != 200:
+                raise _http_error(response)
+
+            for line in response.iter_lines(decode_unicode=True):
+                if not line or not line.startswith("data:"):
+                    continue
+                data = line[len("data:"):].strip()
+                if data == "[DONE]":
+                    break
+                try:
+                    delta = _loads(data)["choices"][0].get("delta", {})
+                except (ValueError, KeyError, IndexError) as exc:  # pragma: no cover - API contract
+                    raise LLMError(f"解析大模型响应失败: {data}") from exc
+                content = delta.get("content")
+                if content:
+                    yield content
+
+
+__all__ = ["ChatService", "ChatMessage", "LLMError", "TokenBucket", "estimate_tokens"]
 
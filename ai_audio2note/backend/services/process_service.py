@@ -2,11 +2,16 @@
 Minimal ProcessService: Only keeps video download functionality
 """
 
+import logging
 import os
 import re
+import shutil
+import tempfile
 from pathlib import Path
 from .audio_downloader import AudioDownloader
 
+logger = logging.getLogger(__name__)
+
 
 def sanitize_filename(name: str) -> str:
     """Sanitize filename to avoid invalid characters."""
@@ -20,6 +25,19 @@ class ProcessService:
     def __init__(self, download_dir: str | os.PathLike | None = None):
         base = Path(download_dir).expanduser() if download_dir else Path.cwd() / "temp"
         self.base_dir = base
+        self._downloader: AudioDownloader | None = None
+
+    def _get_downloader(self) -> AudioDownloader:
+        """复用同一个下载器，使 yt-dlp 实例在多次请求间共享"""
+        if self._downloader is None:
+            self._downloader = AudioDownloader(str(self.base_dir))
+        return self._downloader
+
+    def close(self) -> None:
+        """释放下载器持有的 yt-dlp 实例，服务不再使用时调用"""
+        if self._downloader is not None:
+            self._downloader.close()
+            self._downloader = None
 
     def process_video(self, url: str, page_number: int | None = None) -> dict:
         """
@@ -37,23 +55,31 @@ class ProcessService:
         """
         try:
             base_path = self.base_dir
-            print(f"ProcessService: 下载目录 = {base_path}")
+            logger.info("ProcessService: 下载目录 = %s", base_path)
             base_path.mkdir(parents=True, exist_ok=True)
 
-            downloader = AudioDownloader(str(base_path))
-            video_title = downloader.get_video_title(url)
-            if not video_title:
-                return {"success": False, "error": "无法获取视频标题"}
+            # 先下载到临时目录，标题与下载共用一次视频信息解析
+            staging_folder = Path(tempfile.mkdtemp(prefix=".download-", dir=base_path))
+            try:
+                info = self._get_downloader().download_audio_with_info(
+                    url, page_number, output_dir=str(staging_folder)
+                )
+                video_title = info.get("title") or "未知标题"
 
-            safe_title = sanitize_filename(video_title)
-            session_folder = base_path / safe_title
-            print(f"创建会话文件夹: {session_folder}")
-            session_folder.mkdir(parents=True, exist_ok=True)
+                safe_title = sanitize_filename(video_title)
+                session_folder = base_path / safe_title
+                logger.info("创建会话文件夹: %s", session_folder)
+                session_folder.mkdir(parents=True, exist_ok=True)
 
-            downloader = AudioDownloader(str(session_folder))
-            downloader.download_audio(url, page_number)
+                # 临时目录位于下载目录内，同一文件系统下直接原子重命名
+                with os.scandir(staging_folder) as entries:
+                    for entry in entries:
+                        os.replace(entry.path, session_folder / entry.name)
+            finally:
+                shutil.rmtree(staging_folder, ignore_errors=True)
 
-            files = [str(path) for path in session_folder.iterdir() if path.is_file()]
+            with os.scandir(session_folder) as entries:
+                files = [entry.path for entry in entries if entry.is_file()]
 
             return {
                 "success": True,
@@ -4,33 +4,105 @@ Audio transcription service backed by faster-whisper.
 
 from __future__ import annotations
 
+import functools
+import threading
 from pathlib import Path
-from typing import Callable, Dict, Optional, Tuple
-
-try:
-    from faster_whisper import WhisperModel
-except ImportError as exc:  # pragma: no cover - handled at runtime
-    raise RuntimeError(
-        "未检测到 faster-whisper，请运行 `pip install faster-whisper` 后重试。"
-    ) from exc
-
-_MODEL_CACHE: Dict[str, WhisperModel] = {}
-
-
-def _get_model(model_size: str) -> WhisperModel:
-    model = _MODEL_CACHE.get(model_size)
+from typing import TYPE_CHECKING, Callable, Dict, Optional, Tuple
+
+if TYPE_CHECKING:
+    from faster_whisper import BatchedInferencePipeline, WhisperModel
+
+# int8 量化：GPU 上使用 int8_float16，CPU 上使用 int8
+_COMPUTE_TYPES = {"cuda": "int8_float16", "cpu": "int8"}
+BATCH_SIZE = 16
+
+_CacheKey = Tuple[str, str, Optional[str]]
+_MODEL_CACHE: Dict[_CacheKey, WhisperModel] = {}
+_PIPELINE_CACHE: Dict[_CacheKey, BatchedInferencePipeline] = {}
+# 防止多个线程同时首次加载同一模型，重复占用内存
+_CACHE_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def _faster_whisper():
+    """首次转写时才导入 faster-whisper，它会连带加载 ctranslate2、numpy 等大型依赖。"""
+    try:
+        import faster_whisper
+    except ImportError as exc:  # pragma: no cover - handled at runtime
+        raise RuntimeError(
+            "未检测到 faster-whisper，请运行 `pip install faster-whisper` 后重试。"
+        ) from exc
+    return faster_whisper
+
+
+@functools.lru_cache(maxsize=1)
+def _cuda_available() -> bool:
+    """探测 CUDA 会导入 ctranslate2 并初始化 CUDA 运行时，只应在转写线程中首次加载模型时调用。"""
+    try:
+        import ctranslate2
+    except ImportError:  # pragma: no cover - 转写时会给出明确的缺失提示
+        return False
+    return ctranslate2.get_cuda_device_count() > 0
+
+
+def _resolve_device(device: str = "auto") -> str:
+    if device != "auto":
+        return device
+    return "cuda" if _cuda_available() else "cpu"
+
+
+def _get_model(
+    model_size: str, compute_type: Optional[str] = None, device: str = "auto"
+) -> WhisperModel:
+    device = _resolve_device(device)
+    key = (model_size, device, compute_type)
+    model = _MODEL_CACHE.get(key)
     if model:
         return model
-    model = WhisperModel(model_size, device="auto", compute_type="auto")
-    _MODEL_CACHE[model_size] = model
+    with _CACHE_LOCK:
+        model = _MODEL_CACHE.get(key)
+        if model is None:
+            # 设备不支持所选精度时，CTranslate2 会自动回退到最接近的可用类型
+            model = _faster_whisper().WhisperModel(
+                model_size,
+                device=device,
+                compute_type=compute_type or _COMPUTE_TYPES[device],
+            )
+            _MODEL_CACHE[key] = model
     return model
 
 
+def _get_pipeline(
+    model_size: str, compute_type: Optional[str] = None, device: str = "auto"
+) -> BatchedInferencePipeline:
+    device = _resolve_device(device)
+    key = (model_size, device, compute_type)
+    pipeline = _PIPELINE_CACHE.get(key)
+    if pipeline:
+        return pipeline
+    model = _get_model(model_size, compute_type, device)
+    with _CACHE_LOCK:
+        pipeline = _PIPELINE_CACHE.get(key)
+        if pipeline is None:
+            pipeline = _faster_whisper().BatchedInferencePipeline(model=model)
+            _PIPELINE_CACHE[key] = pipeline
+    return pipeline
+
+
 class TranscriptionService:
     """使用 faster-whisper 将音频转写为文本的服务。"""
 
-    def __init__(self, model_size: str = "base"):
+    def __init__(
+        self,
+        model_size: str = "base",
+        compute_type: Optional[str] = None,
+        device: str = "auto",
+    ):
         self.default_model_size = model_size
+        # None 表示按设备自动选择（GPU: int8_float16，CPU: int8）
+        self.compute_type = compute_type
+        # auto 表示有 CUDA 时使用 GPU，否则使用 CPU
+        self.device = device
 
     def transcribe_audio(
         self,
@@ -57,9 +129,10 @@ class TranscriptionService:
         if progress_callback:
             progress_callback(f"正在加载模型（{chosen_model}）...")
 
-        model = _get_model(chosen_model)
-        segments, info = model.transcribe(
+        pipeline = _get_pipeline(chosen_model, self.compute_type, self.device)
+        segments, info = pipeline.transcribe(
             str(path),
+            batch_size=BATCH_SIZE,
             beam_size=1,
             vad_filter=True,
             compression_ratio_threshold=2.4,
@@ -80,6 +153,8 @@ class TranscriptionService:
             "language": info.language or "未知",
             "duration": f"{info.duration:.1f}s" if info.duration else "",
             "model": chosen_model,
+            "compute_type": self.compute_type or "auto",
+            "device": _resolve_device(self.device),
         }
         return transcript, metadata
 
@@ -4,16 +4,24 @@ PySide6-based desktop application for AI Audio2Note.
 
 from __future__ import annotations
 
+import functools
 import json
+import os
+import random
+import re
 import sys
-from dataclasses import dataclass
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import List, Optional
+from typing import Iterable, Iterator, List, Optional
 
-from PySide6.QtCore import QThread, Qt, Signal, Slot, QTimer
-from PySide6.QtGui import QDesktopServices, QColor
+from PySide6.QtCore import QObject, QRunnable, QThread, QThreadPool, Qt, Signal, Slot, QTimer
+from PySide6.QtGui import QDesktopServices, QColor, QGuiApplication, QTextCursor
 from PySide6.QtWidgets import (
     QApplication,
+    QButtonGroup,
     QFileDialog,
     QLabel,
     QLineEdit,
@@ -39,21 +47,414 @@ from PySide6.QtCore import QUrl
 
 from ai_audio2note.backend.services.process_service import ProcessService
 from ai_audio2note.backend.services.transcription_service import TranscriptionService
-from ai_audio2note.backend.services.chat_service import ChatService, ChatMessage, LLMError
+from ai_audio2note.backend.services.chat_service import (
+    ChatService,
+    ChatMessage,
+    LLMError,
+    TokenBucket,
+    estimate_tokens,
+)
+
+try:  # 可选依赖：orjson 解析快 2~3 倍、序列化快约 5 倍
+    import orjson
+
+    def _loads(data: bytes):
+        return orjson.loads(data)
+
+    def _dumps(obj) -> bytes:
+        return orjson.dumps(obj)
+
+except ImportError:  # pragma: no cover - 未安装时回退到标准库
+
+    def _loads(data: bytes):
+        return json.loads(data.decode("utf-8"))
+
+    def _dumps(obj) -> bytes:
+        return json.dumps(obj, ensure_ascii=False).encode("utf-8")
 
 
 DEFAULT_DOWNLOAD_DIR = Path.home() / "AI_Audio2Note_Downloads"
 HISTORY_FILE = Path.home() / ".ai_audio2note_history.json"
+HISTORY_LIMIT = 20
 SUPPORTED_DOMAINS = ("bilibili.com", "youtube.com", "youtu.be")
+# 非原生文件对话框：避免系统外壳扩展在大目录下逐个枚举文件导致卡顿
+_FILE_DIALOG_OPTIONS = QFileDialog.Option.DontUseNativeDialog
+AUDIO_FILE_FILTER = "音频文件 (*.mp3 *.wav *.m4a *.flac *.aac *.ogg);;所有文件 (*.*)"
+# 预编译的链接校验规则，由 SUPPORTED_DOMAINS 生成（允许 www./m. 等子域名）
+_URL_RE = re.compile(
+    r"^(?:https?://)?(?:[\w-]+\.)*(%s)(?:[/?#:]|$)" % "|".join(map(re.escape, SUPPORTED_DOMAINS)),
+    re.IGNORECASE,
+)
+_PLATFORM_LABELS = {"bilibili.com": "B站", "youtube.com": "YouTube", "youtu.be": "YouTube"}
+
+
+@functools.lru_cache(maxsize=64)
+def _classify_url(url: str) -> Optional[tuple[str, str]]:
+    """返回 (平台名称, 规范化链接)，不支持的链接返回 None；重复粘贴/重试时直接命中缓存。"""
+    normalized = url.strip()
+    match = _URL_RE.match(normalized)
+    if match is None:
+        return None
+    return _PLATFORM_LABELS[match.group(1).lower()], normalized
+
+# 全局样式表：在 QApplication 上设置一次，所有窗口共享
+_STYLESHEET = """
+QWidget {
+    background-color: #f4f6fb;
+    color: #1f2937;
+    font-family: 'PingFang SC', 'Microsoft YaHei', 'Segoe UI', sans-serif;
+    font-size: 14px;
+}
+QFrame#sidebar {
+    background-color: #ffffff;
+    border-radius: 20px;
+    border: 1px solid rgba(203, 213, 225, 0.7);
+}
+QLabel#sidebarTitle {
+    font-size: 20px;
+    font-weight: 700;
+    color: #1d4ed8;
+}
+QLabel#sidebarSubtitle {
+    font-size: 13px;
+    color: #475569;
+}
+QLabel#sidebarVersion {
+    font-size: 12px;
+    color: #94a3b8;
+}
+QPushButton[kind="sidebar"] {
+    padding: 12px 16px;
+    border-radius: 12px;
+    text-align: left;
+    font-weight: 600;
+    color: #1f2937;
+    border: 1px solid transparent;
+    background-color: transparent;
+}
+QPushButton[kind="sidebar"]:hover {
+    background-color: #e0e7ff;
+    border-color: rgba(99, 102, 241, 0.35);
+}
+QPushButton[kind="sidebar"]:checked {
+    background-color: #3b82f6;
+    color: #ffffff;
+    border-color: rgba(59, 130, 246, 0.8);
+}
+QFrame#headerFrame {
+    background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                                stop:0 #f8fbff, stop:1 #e8f0ff);
+    border-radius: 20px;
+    border: 1px solid rgba(59, 130, 246, 0.18);
+}
+QLabel#heroTitle {
+    font-size: 28px;
+    font-weight: 700;
+    color: #1d4ed8;
+}
+QLabel#heroSubtitle {
+    font-size: 16px;
+    color: #2563eb;
+    font-weight: 600;
+}
+QLabel#heroHelper {
+    font-size: 13px;
+    color: #475569;
+}
+QFrame#card {
+    background-color: #ffffff;
+    border-radius: 20px;
+    border: 1px solid rgba(203, 213, 225, 0.7);
+}
+QLabel#sectionTitle {
+    font-size: 16px;
+    font-weight: 600;
+    color: #1f2937;
+}
+QLabel#fieldLabel {
+    font-size: 13px;
+    font-weight: 600;
+    color: #334155;
+}
+QLabel#helperText {
+    font-size: 12px;
+    color: #64748b;
+}
+QLabel#directoryLabel {
+    padding: 10px 12px;
+    border-radius: 12px;
+    background-color: #f8fafc;
+    border: 1px solid rgba(148, 163, 184, 0.45);
+    color: #1e293b;
+}
+QLineEdit,
+QSpinBox,
+QComboBox {
+    padding: 10px 12px;
+    border-radius: 12px;
+    border: 1px solid rgba(148, 163, 184, 0.5);
+    background-color: #ffffff;
+    color: #0f172a;
+    selection-background-color: rgba(59, 130, 246, 0.25);
+    selection-color: #0f172a;
+}
+QLineEdit:focus,
+QSpinBox:focus,
+QComboBox:focus {
+    border-color: #3b82f6;
+    background-color: #f8faff;
+}
+QComboBox::drop-down {
+    border: none;
+    width: 22px;
+}
+QPushButton {
+    border-radius: 12px;
+    padding: 12px 16px;
+    font-weight: 600;
+    border: 1px solid transparent;
+    font-size: 15px;
+}
+QPushButton[kind="primary"] {
+    background-color: #2563eb;
+    color: #ffffff;
+}
+QPushButton[kind="primary"]:hover {
+    background-color: #1d4ed8;
+}
+QPushButton[kind="primary"]:disabled {
+    background-color: rgba(37, 99, 235, 0.35);
+    color: rgba(255, 255, 255, 0.7);
+}
+QPushButton[kind="secondary"] {
+    background-color: #f1f5ff;
+    color: #1f2937;
+    border: 1px solid rgba(99, 102, 241, 0.45);
+}
+QPushButton[kind="secondary"]:hover {
+    background-color: #dbeafe;
+}
+QPushButton[kind="secondary"]:disabled {
+    color: rgba(15, 23, 42, 0.45);
+    background-color: rgba(224, 231, 255, 0.7);
+}
+QPushButton[kind="secondary"]:focus,
+QPushButton[kind="primary"]:focus,
+QPushButton[kind="ghost"]:focus,
+QPushButton[kind="sidebar"]:focus {
+    outline: none;
+}
+QPushButton[kind="ghost"] {
+    background-color: transparent;
+    color: #475569;
+    border: 1px dashed rgba(148, 163, 184, 0.6);
+    padding: 10px 14px;
+}
+QPushButton[kind="ghost"]:hover {
+    color: #1d4ed8;
+    border-color: rgba(37, 99, 235, 0.6);
+}
+QPushButton[kind="ghost"]:checked {
+    background-color: #dbeafe;
+    color: #1d4ed8;
+    border-style: solid;
+    border-color: rgba(37, 99, 235, 0.6);
+}
+QPlainTextEdit#logOutput {
+    background-color: #f8fafc;
+    border-radius: 16px;
+    border: 1px solid rgba(148, 163, 184, 0.35);
+    padding: 12px;
+    color: #0f172a;
+}
+QTextEdit#chatInput {
+    border-radius: 16px;
+    border: 1px solid rgba(148, 163, 184, 0.35);
+    background-color: #f8fafc;
+    padding: 12px;
+    color: #0f172a;
+}
+QPlainTextEdit#pathOutput {
+    background-color: #f8fafc;
+    border-radius: 12px;
+    border: 1px solid rgba(148, 163, 184, 0.45);
+    padding: 8px 12px;
+    color: #0f172a;
+}
+QListWidget#historyList {
+    background-color: #f8fafc;
+    border-radius: 16px;
+    border: 1px solid rgba(148, 163, 184, 0.25);
+    padding: 8px;
+}
+QListWidget#historyList::item {
+    border-radius: 10px;
+    padding: 10px;
+    margin: 4px;
+    color: #0f172a;
+}
+QListWidget#historyList::item:hover {
+    background-color: rgba(191, 219, 254, 0.6);
+}
+QListWidget#historyList::item:selected {
+    background-color: #bfdbfe;
+    color: #1d4ed8;
+}
+QFrame#divider {
+    background-color: rgba(148, 163, 184, 0.24);
+    max-height: 1px;
+    min-height: 1px;
+}
+QProgressBar#progressBar {
+    height: 14px;
+    border-radius: 10px;
+    border: 1px solid rgba(148, 163, 184, 0.28);
+    background-color: #e2e8f0;
+    text-align: center;
+    color: transparent;
+}
+QProgressBar#progressBar::chunk {
+    border-radius: 8px;
+    background-color: #3b82f6;
+}
+QLabel#statusLabel {
+    padding: 10px 14px;
+    border-radius: 12px;
+    font-weight: 600;
+    border: 1px solid transparent;
+    color: #2563eb;
+    background-color: rgba(37, 99, 235, 0.12);
+}
+QLabel#statusLabel[status="info"] {
+    color: #2563eb;
+    background-color: rgba(37, 99, 235, 0.12);
+}
+QLabel#statusLabel[status="success"] {
+    color: #16a34a;
+    background-color: rgba(74, 222, 128, 0.18);
+}
+QLabel#statusLabel[status="error"] {
+    color: #dc2626;
+    background-color: rgba(248, 113, 113, 0.2);
+}
+QLabel#statusLabel[status="loading"] {
+    color: #ca8a04;
+    background-color: rgba(250, 204, 21, 0.24);
+}
+QScrollBar:vertical, QScrollBar:horizontal {
+    background: transparent;
+    width: 10px;
+    height: 10px;
+}
+QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
+    background: rgba(148, 163, 184, 0.48);
+    border-radius: 4px;
+}
+QScrollBar::handle:vertical:hover, QScrollBar::handle:horizontal:hover {
+    background: rgba(148, 163, 184, 0.7);
+}
+"""
 
-
-@dataclass
+# 卡片与侧边栏的阴影参数，所有阴影共享同一个颜色对象
+_SHADOW_COLOR = QColor(15, 23, 42, 60)
+_SHADOW_FRAMES = frozenset({"card", "sidebar"})
+
+# 句末标点（中英文）或换行，用于按句子边界切分长文本
+_SENTENCE_END_RE = re.compile(r"(?:[。！？!?]+|\.(?=\s)|\n)\s*")
+
+
+def _smart_chunk_bounds(text: str, target: int, overlap: int = 0) -> list[tuple[int, int]]:
+    """
+    按句子边界把文本切成不超过 target 字符的片段，返回 (start, end) 偏移列表。
+
+    单句超过 target 时按字符硬切；overlap > 0 时每段向前多带 overlap 个字符作为上下文。
+    """
+    ends = [match.end() for match in _SENTENCE_END_RE.finditer(text)]
+    if not ends or ends[-1] != len(text):
+        ends.append(len(text))
+
+    bounds: list[tuple[int, int]] = []
+    start = 0
+    cut = 0
+    for end in ends:
+        if end - start <= target:
+            cut = end
+            continue
+        if cut > start:
+            bounds.append((start, cut))
+            start = cut
+        while end - start > target:
+            bounds.append((start, start + target))
+            start += target
+        cut = end
+    if start < len(text):
+        bounds.append((start, len(text)))
+
+    if overlap > 0:
+        bounds = [(max(0, s - overlap) if i else s, e) for i, (s, e) in enumerate(bounds)]
+    return bounds
+
+
+@dataclass(slots=True, frozen=True)
 class HistoryItem:
     url: str
     title: str
     timestamp: str
 
 
+class HistoryLoadSignals(QObject):
+    loaded = Signal(list)
+
+
+class HistoryLoader(QRunnable):
+    """在线程池中读取并解析历史记录文件，避免阻塞窗口首次绘制。"""
+
+    def __init__(self, path: Path):
+        super().__init__()
+        self.path = path
+        self.signals = HistoryLoadSignals()
+
+    def run(self) -> None:
+        self.signals.loaded.emit(_read_history_file(self.path))
+
+
+def _read_history_file(path: Path) -> List[HistoryItem]:
+    """读取并解析历史记录文件，文件缺失或损坏时返回空列表。"""
+    try:
+        if not path.exists():
+            return []
+        entries = _loads(path.read_bytes())
+        return [
+            HistoryItem(**item)
+            for item in entries
+            if isinstance(item, dict) and {"url", "title", "timestamp"} <= item.keys()
+        ]
+    except Exception:  # noqa: BLE001
+        return []
+
+
+def _write_history_file(path: Path, data: list) -> None:
+    """先写临时文件再原子替换，进程中途退出也不会留下半截文件。"""
+    tmp = path.with_suffix(".json.tmp")
+    tmp.write_bytes(_dumps(data))
+    os.replace(tmp, path)
+
+
+class HistoryWriter(QRunnable):
+    """在线程池中写入历史记录快照，GUI 线程只负责更新内存与列表控件。"""
+
+    def __init__(self, path: Path, data: list):
+        super().__init__()
+        self.path = path
+        self.data = data
+
+    def run(self) -> None:
+        try:
+            _write_history_file(self.path, self.data)
+        except OSError:
+            pass  # 历史记录只是缓存，写入失败不影响使用
+
+
 class DownloadWorker(QThread):
     progress = Signal(str)
     finished = Signal(dict)
@@ -73,7 +474,10 @@ class DownloadWorker(QThread):
 
             self.progress.emit(f"下载目录: {base_path}")
             service = ProcessService(str(base_path))
-            result = service.process_video(self.url, self.page_number)
+            try:
+                result = service.process_video(self.url, self.page_number)
+            finally:
+                service.close()
             self.finished.emit(result)
         except Exception as exc:  # noqa: BLE001
             self.error.emit(str(exc))
@@ -84,62 +488,250 @@ class TranscriptionWorker(QThread):
     finished = Signal(dict)
     error = Signal(str)
 
-    def __init__(self, audio_path: str, model_size: str):
+    # 进度信号最小间隔（秒），避免跨线程信号淹没 GUI 事件队列
+    PROGRESS_INTERVAL = 0.05
+
+    def __init__(self, service: TranscriptionService, audio_path: str):
         super().__init__()
+        self.service = service
         self.audio_path = audio_path
-        self.model_size = model_size
+        self._last_emit = 0.0
+        self._pending_progress: Optional[str] = None
+
+    def _emit_progress(self, message: str) -> None:
+        now = time.monotonic()
+        if now - self._last_emit >= self.PROGRESS_INTERVAL:
+            self._last_emit = now
+            self._pending_progress = None
+            self.progress.emit(message)
+        else:
+            self._pending_progress = message
 
     def run(self) -> None:
         try:
-            service = TranscriptionService(model_size=self.model_size)
-            text, info = service.transcribe_audio(
+            text, info = self.service.transcribe_audio(
                 self.audio_path,
-                progress_callback=self.progress.emit,
+                progress_callback=self._emit_progress,
             )
+            if self._pending_progress is not None:
+                self.progress.emit(self._pending_progress)
             self.finished.emit({"success": True, "text": text, "info": info})
         except Exception as exc:  # noqa: BLE001
             self.error.emit(str(exc))
 
 
+class ChatWorker(QThread):
+    """在后台线程以流式方式发送单轮对话，回复片段到达即推送给界面。"""
+
+    partial = Signal(str)
+    finished = Signal(dict)
+    error = Signal(str)
+
+    def __init__(self, service: ChatService, history: List[ChatMessage], message: str):
+        super().__init__()
+        self.service = service
+        self.history = history
+        self.message = message
+
+    def run(self) -> None:
+        try:
+            chunks: list[str] = []
+            for chunk in self.service.stream_chat(self.history, self.message):
+                chunks.append(chunk)
+                self.partial.emit(chunk)
+            response = "".join(chunks).strip()
+            self.finished.emit({"message": self.message, "response": response})
+        except Exception as exc:  # noqa: BLE001
+            self.error.emit(str(exc))
+
+
 class ChatBatchWorker(QThread):
     progress = Signal(str)
     finished = Signal(dict)
     error = Signal(str)
 
-    def __init__(self, api_key: str, model: str, text: str, instruction: str, chunk_size: int = 5000):
+    # 合并多段文本到同一请求时，单个请求的提示词 token 上限
+    MAX_PROMPT_TOKENS = 32000
+    # 扣除指令后每段文本至少要保留的 token 数，否则切分出的分段过碎、请求数暴增
+    MIN_CHUNK_TOKENS = 512
+
+    def __init__(
+        self,
+        service: ChatService,
+        text: str,
+        instruction: str,
+        chunk_size: int = 5000,
+        max_concurrency: int = 8,
+        rpm_limit: int = 60,
+        tpm_limit: int = 60000,
+        marshal_factor: int = 4,
+        chunk_overlap: int = 0,
+        max_retries: int = 3,
+    ):
         super().__init__()
-        self.api_key = api_key
-        self.model = model
+        self.service = service
         self.text = text
         self.instruction = instruction
         self.chunk_size = max(1, chunk_size)
+        self.max_concurrency = max(1, max_concurrency)
+        self.marshal_factor = max(1, marshal_factor)
+        self.chunk_overlap = max(0, chunk_overlap)
+        self.max_retries = max(1, max_retries)
+        # 提示词中不变的前缀只拼接一次，各分段请求直接复用
+        self._prompt_prefix = f"{instruction}\n\n以下是第 "
+        # 首次估算可能要加载 tiktoken 编码（甚至联网下载），放到 run() 中在后台线程计算
+        self._instruction_tokens = 0
+        # 主动限流：发送前等待配额，而不是触发 429 后再重试
+        self._rpm_bucket = TokenBucket.per_minute(rpm_limit)
+        self._tpm_bucket = TokenBucket.per_minute(tpm_limit)
+
+    def _send(self, service: ChatService, prompt: str) -> str:
+        """发送单个请求；限流、超时和 5xx 错误按指数退避重试，鉴权等错误立即失败。"""
+        attempt = 0
+        while True:
+            self._rpm_bucket.acquire(1)
+            self._tpm_bucket.acquire(estimate_tokens(prompt))
+            try:
+                return service.chat([], prompt)
+            except LLMError as exc:
+                attempt += 1
+                if not exc.retryable or attempt >= self.max_retries:
+                    raise
+            time.sleep(2 ** (attempt - 1) + random.random())
+
+    def _fit_chunk_bounds(self) -> list[tuple[int, int]]:
+        """切分文本；若有分段的 token 数超过单次请求上限，则按比例缩小分段长度重新切分。"""
+        # 预留分段标题等固定文字的开销
+        limit = self.MAX_PROMPT_TOKENS - self._instruction_tokens - 64
+        if limit < self.MIN_CHUNK_TOKENS:
+            raise ValueError(
+                f"处理指令过长（约 {self._instruction_tokens} tokens），"
+                f"单次请求上限为 {self.MAX_PROMPT_TOKENS} tokens，已没有空间容纳转写文本，请精简指令"
+            )
+        size = self.chunk_size
+        while True:
+            bounds = _smart_chunk_bounds(self.text, size, self.chunk_overlap)
+            worst = max((estimate_tokens(self.text[start:end]) for start, end in bounds), default=0)
+            if worst <= limit or size <= 1:
+                return bounds
+            size = max(1, min(size - 1, size * limit // worst))
+
+    def _iter_chunks(self, bounds: list[tuple[int, int]]) -> Iterator[tuple[int, str]]:
+        """按需切片，避免一次性复制整份文本。"""
+        for idx, (start, end) in enumerate(bounds):
+            yield idx, self.text[start:end]
+
+    def _iter_groups(self, chunks: Iterable[tuple[int, str]]) -> Iterator[list[tuple[int, str]]]:
+        """按 marshal_factor 和 token 上限把相邻分段合并为一组。"""
+        budget = self.MAX_PROMPT_TOKENS - self._instruction_tokens
+        current: list[tuple[int, str]] = []
+        used = 0
+        for idx, chunk in chunks:
+            cost = estimate_tokens(chunk)
+            if current and (len(current) >= self.marshal_factor or used + cost > budget):
+                yield current
+                current, used = [], 0
+            current.append((idx, chunk))
+            used += cost
+        if current:
+            yield current
+
+    def _single_prompt(self, chunk: str, idx: int, total: int) -> str:
+        return "".join(
+            (self._prompt_prefix, f"{idx}/{total} 段文本内容，请按要求给出总结或分析：\n\n", chunk)
+        )
+
+    def _marshaled_prompt(self, chunks: list[str], first: int, total: int) -> str:
+        count = len(chunks)
+        segments = "\n\n".join(f"[SEG {i}]\n{chunk}" for i, chunk in enumerate(chunks, start=1))
+        return "".join(
+            (
+                self._prompt_prefix,
+                f"{first}-{first + count - 1}/{total} 段文本内容，共 {count} 段，"
+                f"请分别对每一段按要求给出总结或分析。\n"
+                f"请只返回一个包含 {count} 个字符串的 JSON 数组，按顺序对应每一段。\n\n",
+                segments,
+            )
+        )
+
+    @staticmethod
+    def _split_marshaled_reply(reply: str, count: int) -> Optional[list[str]]:
+        text = reply.strip()
+        fenced = re.match(r"^```(?:json)?\s*(.*?)\s*```$", text, re.DOTALL)
+        if fenced:
+            text = fenced.group(1)
+        try:
+            parsed = json.loads(text)
+        except ValueError:
+            parsed = None
+        if isinstance(parsed, list) and len(parsed) == count and all(isinstance(p, str) for p in parsed):
+            return [p.strip() for p in parsed]
+
+        parts = [p.strip() for p in re.split(r"\[SEG\s*\d+\]", reply)]
+        if parts and not parts[0]:
+            parts = parts[1:]
+        if len(parts) == count:
+            return parts
+        return None
+
+    def _process_group(
+        self, service: ChatService, group: list[tuple[int, str]], total: int
+    ) -> list[str]:
+        if len(group) > 1:
+            first = group[0][0] + 1
+            reply = self._send(service, self._marshaled_prompt([chunk for _, chunk in group], first, total))
+            replies = self._split_marshaled_reply(reply, len(group))
+            if replies is not None:
+                return replies
+        # 单段或合并回复无法拆分时，逐段单独请求
+        return [self._send(service, self._single_prompt(chunk, idx + 1, total)) for idx, chunk in group]
 
     def run(self) -> None:
         try:
-            service = ChatService(api_key=self.api_key, model=self.model)
-            chunks = [
-                self.text[i : i + self.chunk_size]
-                for i in range(0, len(self.text), self.chunk_size)
-            ]
-            if not chunks:
+            service = self.service
+            self._instruction_tokens = estimate_tokens(self.instruction)
+            bounds = self._fit_chunk_bounds()
+            total = len(bounds)
+            if not total:
                 raise ValueError("文本内容为空，无法处理")
 
-            responses: list[ChatMessage] = []
-            total = len(chunks)
-            for idx, chunk in enumerate(chunks, start=1):
-                prompt = (
-                    f"{self.instruction}\n\n"
-                    f"以下是第 {idx}/{total} 段文本内容，请按要求给出总结或分析：\n\n{chunk}"
-                )
-                reply = service.chat([], prompt)
-                responses.append(ChatMessage(role="assistant", content=reply))
-                self.progress.emit(f"已完成第 {idx}/{total} 段处理")
+            responses: list[Optional[ChatMessage]] = [None] * total
+            groups = self._iter_groups(self._iter_chunks(bounds))
+            with ThreadPoolExecutor(max_workers=self.max_concurrency) as executor:
+                # 仅保持 max_concurrency 组在途，分段在需要时才生成
+                in_flight: dict = {}
+
+                def submit_next() -> None:
+                    group = next(groups, None)
+                    if group is not None:
+                        future = executor.submit(self._process_group, service, group, total)
+                        in_flight[future] = [idx for idx, _ in group]
+
+                for _ in range(self.max_concurrency):
+                    submit_next()
+
+                done = 0
+                while in_flight:
+                    completed, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                    for future in completed:
+                        indices = in_flight.pop(future)
+                        try:
+                            replies = future.result()
+                        except Exception:
+                            for pending in in_flight:
+                                pending.cancel()
+                            raise
+                        for idx, reply in zip(indices, replies):
+                            responses[idx] = ChatMessage(role="assistant", content=reply)
+                        done += len(replies)
+                        self.progress.emit(f"已完成 {done}/{total} 段处理")
+                        submit_next()
 
             markdown_sections = [
                 f"## 第 {idx + 1} 段回复\n\n{msg.content}"
                 for idx, msg in enumerate(responses)
             ]
-            combined = "# 大模型回复汇总\n\n" + "\n\n".join(markdown_sections)
+            combined = "\n\n".join(("# 大模型回复汇总", *markdown_sections))
             self.finished.emit({"markdown": combined, "sections": markdown_sections})
         except Exception as exc:  # noqa: BLE001
             self.error.emit(str(exc))
@@ -155,17 +747,30 @@ class MainWindow(QMainWindow):
         self.download_dir: Optional[str] = None
         self.last_session_path: Optional[str] = None
         self.history: List[HistoryItem] = []
+        self._history_save_pending = False
+        self._history_loaded = False
+        self._history_loader: Optional[HistoryLoader] = None
+        # 单线程池保证多次写入按提交顺序落盘
+        self._history_io_pool = QThreadPool(self)
+        self._history_io_pool.setMaxThreadCount(1)
 
         self.worker: Optional[DownloadWorker] = None
         self.transcribe_worker: Optional[TranscriptionWorker] = None
         self.transcribe_selected_file: Optional[str] = None
+        # 记住上次浏览的目录，下次打开对话框直接定位
+        self._last_audio_dir: Optional[str] = None
         self.transcription_result: Optional[str] = None
+        # 按模型复用转写服务，避免每次转写都重新构建
+        self._transcription_services: dict[tuple[str, Optional[str], str], TranscriptionService] = {}
 
         self.chat_api_key: Optional[str] = None
         self.chat_history: List[ChatMessage] = []
         self.chat_service: Optional[ChatService] = None
+        self.chat_worker: Optional[ChatWorker] = None
         self.chat_batch_worker: Optional[ChatBatchWorker] = None
         self.chat_batch_markdown: Optional[str] = None
+        # 推送到大模型页面的转写文本，待页面切换完成后再启动批处理
+        self._pending_transcript: Optional[str] = None
 
         self.sidebar_buttons: List[QPushButton] = []
         self.stacked_widget: Optional[QStackedWidget] = None
@@ -186,6 +791,7 @@ class MainWindow(QMainWindow):
         self.stacked_widget.addWidget(self._create_download_page())
         self.stacked_widget.addWidget(self._create_transcription_page())
         self.stacked_widget.addWidget(self._create_chat_page())
+        self.stacked_widget.currentChanged.connect(self._on_page_changed)
 
         root_layout.addWidget(sidebar, 0)
         root_layout.addWidget(self.stacked_widget, 1)
@@ -215,13 +821,16 @@ class MainWindow(QMainWindow):
             ("音频转文字", 1),
             ("大模型助手", 2),
         ]
+        # 按钮组统一分发点击，按钮 id 即页面索引，无需为每个按钮创建闭包
+        self.sidebar_group = QButtonGroup(sidebar)
         for text, index in pages:
             btn = QPushButton(text)
             btn.setCheckable(True)
             btn.setProperty("kind", "sidebar")
-            btn.clicked.connect(lambda _, i=index: self._switch_page(i))
+            self.sidebar_group.addButton(btn, index)
             self.sidebar_buttons.append(btn)
             layout.addWidget(btn)
+        self.sidebar_group.idClicked.connect(self._switch_page)
 
         layout.addStretch(1)
         version = QLabel("v1.0 桌面版")
@@ -247,7 +856,7 @@ class MainWindow(QMainWindow):
         title.setObjectName("heroTitle")
         header_layout.addWidget(title)
 
-        subtitle = QLabel("支持 Bilibili 与 YouTube 链接，自动提取 192kbps MP3")
+        subtitle = QLabel("支持 Bilibili 与 YouTube 链接，自动提取 VBR MP3")
         subtitle.setObjectName("heroSubtitle")
         header_layout.addWidget(subtitle)
 
@@ -369,6 +978,7 @@ class MainWindow(QMainWindow):
         self.log_output.setReadOnly(True)
         self.log_output.setPlaceholderText("任务日志将在此显示")
         self.log_output.setMinimumHeight(180)
+        self.log_output.setMaximumBlockCount(2000)
         output_layout.addWidget(self.log_output, stretch=1)
 
         output_layout.addWidget(self._create_divider())
@@ -469,6 +1079,37 @@ class MainWindow(QMainWindow):
         model_row.addWidget(self.model_select, stretch=1)
         settings_layout.addLayout(model_row)
 
+        precision_row = QHBoxLayout()
+        precision_row.setSpacing(12)
+        precision_label = QLabel("计算精度")
+        precision_label.setObjectName("fieldLabel")
+        precision_row.addWidget(precision_label)
+
+        self.compute_type_select = QComboBox()
+        self.compute_type_select.addItem("自动 (推荐)", None)
+        self.compute_type_select.addItem("int8 (CPU 最快)", "int8")
+        self.compute_type_select.addItem("int8_float16 (GPU 省显存)", "int8_float16")
+        self.compute_type_select.addItem("float16", "float16")
+        self.compute_type_select.addItem("float32 (最精确)", "float32")
+        self.compute_type_select.setObjectName("modelSelect")
+        precision_row.addWidget(self.compute_type_select, stretch=1)
+        settings_layout.addLayout(precision_row)
+
+        device_row = QHBoxLayout()
+        device_row.setSpacing(12)
+        device_label = QLabel("设备")
+        device_label.setObjectName("fieldLabel")
+        device_row.addWidget(device_label)
+
+        self.device_select = QComboBox()
+        # 选项固定列出，不在构建界面时探测 CUDA；自动模式在转写线程中解析
+        self.device_select.addItem("自动 (推荐)", "auto")
+        self.device_select.addItem("GPU (CUDA)", "cuda")
+        self.device_select.addItem("CPU", "cpu")
+        self.device_select.setObjectName("modelSelect")
+        device_row.addWidget(self.device_select, stretch=1)
+        settings_layout.addLayout(device_row)
+
         settings_layout.addWidget(self._create_divider())
 
         transcribe_actions = QHBoxLayout()
@@ -638,6 +1279,7 @@ class MainWindow(QMainWindow):
         self.chat_history_view.setReadOnly(True)
         self.chat_history_view.setPlaceholderText("这里将显示与 DeepSeek 的对话")
         self.chat_history_view.setMinimumHeight(280)
+        self.chat_history_view.setMaximumBlockCount(10000)
         chat_layout.addWidget(self.chat_history_view, stretch=1)
 
         batch_actions = QHBoxLayout()
@@ -689,274 +1331,25 @@ class MainWindow(QMainWindow):
 
     # ------------------------------------------------------------------ STYLING
     def _apply_styles(self) -> None:
-        self.setStyleSheet(
-            """
-            QWidget {
-                background-color: #f4f6fb;
-                color: #1f2937;
-                font-family: 'PingFang SC', 'Microsoft YaHei', 'Segoe UI', sans-serif;
-                font-size: 14px;
-            }
-            QFrame#sidebar {
-                background-color: #ffffff;
-                border-radius: 20px;
-                border: 1px solid rgba(203, 213, 225, 0.7);
-            }
-            QLabel#sidebarTitle {
-                font-size: 20px;
-                font-weight: 700;
-                color: #1d4ed8;
-            }
-            QLabel#sidebarSubtitle {
-                font-size: 13px;
-                color: #475569;
-            }
-            QLabel#sidebarVersion {
-                font-size: 12px;
-                color: #94a3b8;
-            }
-            QPushButton[kind="sidebar"] {
-                padding: 12px 16px;
-                border-radius: 12px;
-                text-align: left;
-                font-weight: 600;
-                color: #1f2937;
-                border: 1px solid transparent;
-                background-color: transparent;
-            }
-            QPushButton[kind="sidebar"]:hover {
-                background-color: #e0e7ff;
-                border-color: rgba(99, 102, 241, 0.35);
-            }
-            QPushButton[kind="sidebar"]:checked {
-                background-color: #3b82f6;
-                color: #ffffff;
-                border-color: rgba(59, 130, 246, 0.8);
-            }
-            QFrame#headerFrame {
-                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
-                                            stop:0 #f8fbff, stop:1 #e8f0ff);
-                border-radius: 20px;
-                border: 1px solid rgba(59, 130, 246, 0.18);
-            }
-            QLabel#heroTitle {
-                font-size: 28px;
-                font-weight: 700;
-                color: #1d4ed8;
-            }
-            QLabel#heroSubtitle {
-                font-size: 16px;
-                color: #2563eb;
-                font-weight: 600;
-            }
-            QLabel#heroHelper {
-                font-size: 13px;
-                color: #475569;
-            }
-            QFrame#card {
-                background-color: #ffffff;
-                border-radius: 20px;
-                border: 1px solid rgba(203, 213, 225, 0.7);
-            }
-            QLabel#sectionTitle {
-                font-size: 16px;
-                font-weight: 600;
-                color: #1f2937;
-            }
-            QLabel#fieldLabel {
-                font-size: 13px;
-                font-weight: 600;
-                color: #334155;
-            }
-            QLabel#helperText {
-                font-size: 12px;
-                color: #64748b;
-            }
-            QLabel#directoryLabel {
-                padding: 10px 12px;
-                border-radius: 12px;
-                background-color: #f8fafc;
-                border: 1px solid rgba(148, 163, 184, 0.45);
-                color: #1e293b;
-            }
-            QLineEdit,
-            QSpinBox,
-            QComboBox {
-                padding: 10px 12px;
-                border-radius: 12px;
-                border: 1px solid rgba(148, 163, 184, 0.5);
-                background-color: #ffffff;
-                color: #0f172a;
-                selection-background-color: rgba(59, 130, 246, 0.25);
-                selection-color: #0f172a;
-            }
-            QLineEdit:focus,
-            QSpinBox:focus,
-            QComboBox:focus {
-                border-color: #3b82f6;
-                background-color: #f8faff;
-            }
-            QComboBox::drop-down {
-                border: none;
-                width: 22px;
-            }
-            QPushButton {
-                border-radius: 12px;
-                padding: 12px 16px;
-                font-weight: 600;
-                border: 1px solid transparent;
-                font-size: 15px;
-            }
-            QPushButton[kind="primary"] {
-                background-color: #2563eb;
-                color: #ffffff;
-            }
-            QPushButton[kind="primary"]:hover {
-                background-color: #1d4ed8;
-            }
-            QPushButton[kind="primary"]:disabled {
-                background-color: rgba(37, 99, 235, 0.35);
-                color: rgba(255, 255, 255, 0.7);
-            }
-            QPushButton[kind="secondary"] {
-                background-color: #f1f5ff;
-                color: #1f2937;
-                border: 1px solid rgba(99, 102, 241, 0.45);
-            }
-            QPushButton[kind="secondary"]:hover {
-                background-color: #dbeafe;
-            }
-            QPushButton[kind="secondary"]:disabled {
-                color: rgba(15, 23, 42, 0.45);
-                background-color: rgba(224, 231, 255, 0.7);
-            }
-            QPushButton[kind="secondary"]:focus,
-            QPushButton[kind="primary"]:focus,
-            QPushButton[kind="ghost"]:focus,
-            QPushButton[kind="sidebar"]:focus {
-                outline: none;
-            }
-            QPushButton[kind="ghost"] {
-                background-color: transparent;
-                color: #475569;
-                border: 1px dashed rgba(148, 163, 184, 0.6);
-                padding: 10px 14px;
-            }
-            QPushButton[kind="ghost"]:hover {
-                color: #1d4ed8;
-                border-color: rgba(37, 99, 235, 0.6);
-            }
-            QPushButton[kind="ghost"]:checked {
-                background-color: #dbeafe;
-                color: #1d4ed8;
-                border-style: solid;
-                border-color: rgba(37, 99, 235, 0.6);
-            }
-            QPlainTextEdit#logOutput {
-                background-color: #f8fafc;
-                border-radius: 16px;
-                border: 1px solid rgba(148, 163, 184, 0.35);
-                padding: 12px;
-                color: #0f172a;
-            }
-            QTextEdit#chatInput {
-                border-radius: 16px;
-                border: 1px solid rgba(148, 163, 184, 0.35);
-                background-color: #f8fafc;
-                padding: 12px;
-                color: #0f172a;
-            }
-            QPlainTextEdit#pathOutput {
-                background-color: #f8fafc;
-                border-radius: 12px;
-                border: 1px solid rgba(148, 163, 184, 0.45);
-                padding: 8px 12px;
-                color: #0f172a;
-            }
-            QListWidget#historyList {
-                background-color: #f8fafc;
-                border-radius: 16px;
-                border: 1px solid rgba(148, 163, 184, 0.25);
-                padding: 8px;
-            }
-            QListWidget#historyList::item {
-                border-radius: 10px;
-                padding: 10px;
-                margin: 4px;
-                color: #0f172a;
-            }
-            QListWidget#historyList::item:hover {
-                background-color: rgba(191, 219, 254, 0.6);
-            }
-            QListWidget#historyList::item:selected {
-                background-color: #bfdbfe;
-                color: #1d4ed8;
-            }
-            QFrame#divider {
-                background-color: rgba(148, 163, 184, 0.24);
-                max-height: 1px;
-                min-height: 1px;
-            }
-            QProgressBar#progressBar {
-                height: 14px;
-                border-radius: 10px;
-                border: 1px solid rgba(148, 163, 184, 0.28);
-                background-color: #e2e8f0;
-                text-align: center;
-                color: transparent;
-            }
-            QProgressBar#progressBar::chunk {
-                border-radius: 8px;
-                background-color: #3b82f6;
-            }
-            QLabel#statusLabel {
-                padding: 10px 14px;
-                border-radius: 12px;
-                font-weight: 600;
-                border: 1px solid transparent;
-                color: #2563eb;
-                background-color: rgba(37, 99, 235, 0.12);
-            }
-            QLabel#statusLabel[status="info"] {
-                color: #2563eb;
-                background-color: rgba(37, 99, 235, 0.12);
-            }
-            QLabel#statusLabel[status="success"] {
-                color: #16a34a;
-                background-color: rgba(74, 222, 128, 0.18);
-            }
-            QLabel#statusLabel[status="error"] {
-                color: #dc2626;
-                background-color: rgba(248, 113, 113, 0.2);
-            }
-            QLabel#statusLabel[status="loading"] {
-                color: #ca8a04;
-                background-color: rgba(250, 204, 21, 0.24);
-            }
-            QScrollBar:vertical, QScrollBar:horizontal {
-                background: transparent;
-                width: 10px;
-                height: 10px;
-            }
-            QScrollBar::handle:vertical, QScrollBar::handle:horizontal {
-                background: rgba(148, 163, 184, 0.48);
-                border-radius: 4px;
-            }
-            QScrollBar::handle:vertical:hover, QScrollBar::handle:horizontal:hover {
-                background: rgba(148, 163, 184, 0.7);
-            }
-            """
-        )
+        # 样式表挂在 QApplication 上只需解析一次；run_app 已提前设置时这里不再重复
+        app = QApplication.instance()
+        if app is not None and app.styleSheet() != _STYLESHEET:
+            app.setStyleSheet(_STYLESHEET)
 
     def _apply_shadows(self) -> None:
-        for frame in self.findChildren(QFrame):
-            name = frame.objectName()
-            if name in {"card", "sidebar"}:
-                effect = QGraphicsDropShadowEffect(frame)
-                effect.setBlurRadius(24)
-                effect.setColor(QColor(15, 23, 42, 60))
-                effect.setOffset(0, 8)
-                frame.setGraphicsEffect(effect)
+        # 阴影由软件高斯模糊逐帧绘制，缩放比超过 1.5 时像素量已超过两倍，缩放/滚动会明显卡顿
+        if os.environ.get("AI_A2N_NO_SHADOWS", "").strip() not in ("", "0"):
+            return
+        screen = QGuiApplication.primaryScreen()
+        if screen is not None and screen.devicePixelRatio() > 1.5:
+            return
+        frames = [frame for frame in self.findChildren(QFrame) if frame.objectName() in _SHADOW_FRAMES]
+        for frame in frames:
+            effect = QGraphicsDropShadowEffect(frame)
+            effect.setBlurRadius(24)
+            effect.setColor(_SHADOW_COLOR)
+            effect.setOffset(0, 8)
+            frame.setGraphicsEffect(effect)
 
     @staticmethod
     def _create_divider() -> QFrame:
@@ -968,6 +1361,7 @@ class MainWindow(QMainWindow):
         return divider
 
     # ------------------------------------------------------------------ NAVIGATION
+    @Slot(int)
     def _switch_page(self, index: int) -> None:
         if self.stacked_widget is None:
             return
@@ -988,7 +1382,12 @@ class MainWindow(QMainWindow):
             self.page_toggle_btn.setText("启用分P")
 
     def _pick_download_dir(self) -> None:
-        directory = QFileDialog.getExistingDirectory(self, "选择下载目录")
+        directory = QFileDialog.getExistingDirectory(
+            self,
+            "选择下载目录",
+            self.download_dir or str(DEFAULT_DOWNLOAD_DIR),
+            _FILE_DIALOG_OPTIONS | QFileDialog.Option.ShowDirsOnly,
+        )
         if directory:
             self.download_dir = directory
             self.dir_label.setText(directory)
@@ -999,9 +1398,11 @@ class MainWindow(QMainWindow):
         if not url:
             self._show_error("请输入视频链接")
             return
-        if not self._is_supported_url(url):
+        classified = _classify_url(url)
+        if classified is None:
             self._show_error("仅支持B站与YouTube视频链接")
             return
+        platform, url = classified
 
         page_number = None
         if self.page_input.isEnabled():
@@ -1009,7 +1410,7 @@ class MainWindow(QMainWindow):
             page_number = value or None
 
         self.log_output.clear()
-        self._append_log("开始处理任务...")
+        self._append_log(f"开始处理任务（{platform}）...")
         self._set_download_loading_state(True, "正在下载，请稍候...")
 
         self.worker = DownloadWorker(url, page_number, self.download_dir)
@@ -1030,7 +1431,10 @@ class MainWindow(QMainWindow):
             self.download_progress_bar.setRange(0, 100)
             self.download_progress_bar.setValue(0)
 
-    def _append_log(self, message: str) -> None:
+    def _append_log(self, message: str | Iterable[str]) -> None:
+        # 多行内容拼接后一次追加，只触发一次排版
+        if not isinstance(message, str):
+            message = "\n".join(message)
         self.log_output.appendPlainText(message)
 
     def _on_download_finished(self, result: dict) -> None:
@@ -1053,7 +1457,7 @@ class MainWindow(QMainWindow):
             if files:
                 summary_lines.append("生成的文件：")
                 summary_lines.extend(files)
-            self._append_log("\n".join(summary_lines))
+            self._append_log(summary_lines)
 
             self._set_status("下载完成 ✅", "success", self.download_status_label)
             self._save_history_entry(result)
@@ -1081,13 +1485,18 @@ class MainWindow(QMainWindow):
             self._set_status("已从历史记录填充链接", "success", self.download_status_label)
 
     def _is_supported_url(self, url: str) -> bool:
-        return any(domain in url for domain in SUPPORTED_DOMAINS)
+        return _classify_url(url) is not None
 
     # ------------------------------------------------------------------ TRANSCRIPTION FLOW
     def _select_audio_file(self) -> None:
-        filters = "音频文件 (*.mp3 *.wav *.m4a *.flac *.aac *.ogg);;所有文件 (*.*)"
-        file_path, _ = QFileDialog.getOpenFileName(self, "选择音频文件", str(Path.home()), filters)
+        start_dir = self._last_audio_dir or self.last_session_path or self.download_dir
+        if start_dir is None:
+            start_dir = str(DEFAULT_DOWNLOAD_DIR if DEFAULT_DOWNLOAD_DIR.exists() else Path.home())
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "选择音频文件", start_dir, AUDIO_FILE_FILTER, options=_FILE_DIALOG_OPTIONS
+        )
         if file_path:
+            self._last_audio_dir = str(Path(file_path).parent)
             self.transcribe_selected_file = file_path
             self.transcribe_file_view.setPlainText(file_path)
             self.transcribe_start_btn.setEnabled(True)
@@ -1103,11 +1512,15 @@ class MainWindow(QMainWindow):
             return
 
         model_size = self.model_select.currentData()
+        compute_type = self.compute_type_select.currentData()
+        device = self.device_select.currentData()
         self.transcribe_text_output.clear()
         self.transcribe_save_btn.setEnabled(False)
         self._set_transcribe_loading_state(True, "正在转写，请稍候...")
 
-        self.transcribe_worker = TranscriptionWorker(str(audio_path), model_size)
+        self.transcribe_worker = TranscriptionWorker(
+            self._get_transcription_service(model_size, compute_type, device), str(audio_path)
+        )
         self.transcribe_worker.progress.connect(
             lambda message: self._set_status(message, "loading", self.transcribe_status_label)
         )
@@ -1115,10 +1528,24 @@ class MainWindow(QMainWindow):
         self.transcribe_worker.error.connect(self._on_transcription_error)
         self.transcribe_worker.start()
 
+    def _get_transcription_service(
+        self, model_size: str, compute_type: Optional[str] = None, device: str = "auto"
+    ) -> TranscriptionService:
+        key = (model_size, compute_type, device)
+        service = self._transcription_services.get(key)
+        if service is None:
+            service = TranscriptionService(
+                model_size=model_size, compute_type=compute_type, device=device
+            )
+            self._transcription_services[key] = service
+        return service
+
     def _set_transcribe_loading_state(self, loading: bool, message: str = "") -> None:
         self.transcribe_start_btn.setEnabled(not loading)
         self.transcribe_pick_btn.setEnabled(not loading)
         self.model_select.setEnabled(not loading)
+        self.compute_type_select.setEnabled(not loading)
+        self.device_select.setEnabled(not loading)
         self.transcribe_progress_bar.setVisible(loading)
         if loading:
             self.transcribe_progress_bar.setRange(0, 0)
@@ -1175,7 +1602,7 @@ class MainWindow(QMainWindow):
             "文本文件 (*.txt);;所有文件 (*.*)",
         )
         if file_path:
-            Path(file_path).write_text(text, encoding="utf-8")
+            Path(file_path).write_bytes(text.encode("utf-8"))
             self._set_status(f"已保存到：{file_path}", "success", self.transcribe_status_label)
 
     # ------------------------------------------------------------------ CHAT FLOW
@@ -1184,8 +1611,18 @@ class MainWindow(QMainWindow):
         if not self.transcription_result or not self.transcription_result.strip():
             self._set_status("没有可推送的转写内容", "error", self.transcribe_status_label)
             return
-        self._switch_page(2)
-        QTimer.singleShot(150, lambda: self._start_chat_batch(self.transcription_result or ""))
+        self._pending_transcript = self.transcription_result
+        if self.stacked_widget is not None and self.stacked_widget.currentIndex() == 2:
+            self._on_page_changed(2)
+        else:
+            self._switch_page(2)
+
+    @Slot(int)
+    def _on_page_changed(self, index: int) -> None:
+        if index != 2 or self._pending_transcript is None:
+            return
+        text, self._pending_transcript = self._pending_transcript, None
+        self._start_chat_batch(text)
 
     def _run_transcript_batch(self) -> None:
         if not self.transcription_result or not self.transcription_result.strip():
@@ -1200,7 +1637,10 @@ class MainWindow(QMainWindow):
             self._set_status("请填写有效的 API Key", "error", self.chat_status_label)
             return
         self.chat_api_key = api_key
-        self.chat_service = ChatService(api_key=api_key, model=model)
+        # 凭据未变时沿用现有服务，保留其中已建立的 HTTP 长连接
+        service = self.chat_service
+        if service is None or service.api_key != api_key or service.model != model:
+            self.chat_service = ChatService(api_key=api_key, model=model)
         self._set_status("DeepSeek 已就绪，可以开始对话", "success", self.chat_status_label)
 
     def _start_chat_batch(self, text: str) -> None:
@@ -1210,7 +1650,7 @@ class MainWindow(QMainWindow):
         if not text.strip():
             self._set_status("转写内容为空，无法处理", "error", self.chat_status_label)
             return
-        if not self.chat_api_key:
+        if not self.chat_service:
             self._set_status("请先保存 DeepSeek API Key", "error", self.chat_status_label)
             return
         instruction = self.chat_instruction_input.toPlainText().strip()
@@ -1224,9 +1664,9 @@ class MainWindow(QMainWindow):
         self._set_status("正在批量处理转写文本...", "loading", self.chat_status_label)
         self.chat_history_view.appendPlainText("系统：开始批量处理转写文本...\n")
 
+        # 复用已保存的 ChatService，批处理各段共享其 HTTP 连接池
         self.chat_batch_worker = ChatBatchWorker(
-            api_key=self.chat_api_key,
-            model=self.chat_model_select.currentData(),
+            service=self.chat_service,
             text=text,
             instruction=instruction,
             chunk_size=5000,
@@ -1242,25 +1682,29 @@ class MainWindow(QMainWindow):
 
     def _on_chat_batch_finished(self, result: dict) -> None:
         self.chat_run_batch_btn.setEnabled(True)
-        self.chat_send_btn.setEnabled(True)
         self.chat_batch_worker = None
+        self._update_chat_send_btn()
 
         markdown = result.get("markdown", "")
         sections = result.get("sections", [])
-        if sections:
-            for section in sections:
-                self.chat_history_view.appendPlainText(f"AI 批处理回复：\n{section}\n")
+        lines = [f"AI 批处理回复：\n{section}\n" for section in sections]
+        lines.append("系统：批处理完成，已生成 Markdown 文档。\n")
+        # 所有分段合并为一次追加，并在追加期间暂停重绘
+        self.chat_history_view.setUpdatesEnabled(False)
+        try:
+            self.chat_history_view.appendPlainText("\n".join(lines))
+        finally:
+            self.chat_history_view.setUpdatesEnabled(True)
 
         self.chat_batch_markdown = markdown
         if markdown.strip():
             self.chat_download_btn.setEnabled(True)
         self._set_status("批处理完成 ✅", "success", self.chat_status_label)
-        self.chat_history_view.appendPlainText("系统：批处理完成，已生成 Markdown 文档。\n")
 
     def _on_chat_batch_error(self, message: str) -> None:
         self.chat_run_batch_btn.setEnabled(True)
-        self.chat_send_btn.setEnabled(True)
         self.chat_batch_worker = None
+        self._update_chat_send_btn()
         self._set_status(f"批处理失败：{message}", "error", self.chat_status_label)
         self.chat_history_view.appendPlainText(f"系统：批处理失败，原因：{message}\n")
         self.chat_download_btn.setEnabled(bool(self.chat_batch_markdown and self.chat_batch_markdown.strip()))
@@ -1276,7 +1720,7 @@ class MainWindow(QMainWindow):
             "Markdown 文件 (*.md);;所有文件 (*.*)",
         )
         if file_path:
-            Path(file_path).write_text(self.chat_batch_markdown, encoding="utf-8")
+            Path(file_path).write_bytes(self.chat_batch_markdown.encode("utf-8"))
             self._set_status(f"已保存到：{file_path}", "success", self.chat_status_label)
 
     def _handle_chat_send(self) -> None:
@@ -1287,31 +1731,52 @@ class MainWindow(QMainWindow):
         if not self.chat_service:
             self._set_status("请先保存 API Key", "error", self.chat_status_label)
             return
+        if self.chat_worker and self.chat_worker.isRunning():
+            return
 
         self.chat_send_btn.setEnabled(False)
         self._set_status("正在向大模型提问...", "loading", self.chat_status_label)
 
-        def run_chat() -> None:
-            try:
-                response = self.chat_service.chat(self.chat_history, message)
-                self.chat_history.append(ChatMessage(role="user", content=message))
-                self.chat_history.append(ChatMessage(role="assistant", content=response))
-                self._append_chat(f"用户：{message}\n\nAI：{response}\n{'-' * 24}\n")
-                self.chat_input.clear()
-                self._set_status("回复已返回", "success", self.chat_status_label)
-            except Exception as exc:  # noqa: BLE001
-                self._set_status(str(exc), "error", self.chat_status_label)
-            finally:
-                self.chat_send_btn.setEnabled(True)
-
-        # 直接调用，不开线程（请求本身在 requests 中阻塞，界面仍可用）
-        run_chat()
+        self._append_chat(f"用户：{message}\n\nAI：")
+        self.chat_worker = ChatWorker(self.chat_service, list(self.chat_history), message)
+        self.chat_worker.partial.connect(self._on_chat_partial)
+        self.chat_worker.finished.connect(self._on_chat_reply)
+        self.chat_worker.error.connect(self._on_chat_error)
+        self.chat_worker.start()
+
+    def _on_chat_partial(self, chunk: str) -> None:
+        # 片段直接接在当前 AI 回复之后，不另起段落
+        self.chat_history_view.moveCursor(QTextCursor.End)
+        self.chat_history_view.insertPlainText(chunk)
+
+    def _on_chat_reply(self, result: dict) -> None:
+        self.chat_worker = None
+        message = result["message"]
+        response = result["response"]
+        self.chat_history.append(ChatMessage(role="user", content=message))
+        self.chat_history.append(ChatMessage(role="assistant", content=response))
+        self._on_chat_partial(f"\n{'-' * 24}\n")
+        self.chat_input.clear()
+        self._set_status("回复已返回", "success", self.chat_status_label)
+        self._update_chat_send_btn()
+
+    def _on_chat_error(self, message: str) -> None:
+        self.chat_worker = None
+        self._on_chat_partial(f"\n（回复中断：{message}）\n{'-' * 24}\n")
+        self._set_status(message, "error", self.chat_status_label)
+        self._update_chat_send_btn()
+
+    def _update_chat_send_btn(self) -> None:
+        # 单轮对话与批处理共用发送按钮，两者都结束后才重新启用
+        busy = any(
+            worker is not None and worker.isRunning()
+            for worker in (self.chat_worker, self.chat_batch_worker)
+        )
+        self.chat_send_btn.setEnabled(not busy)
 
     def _append_chat(self, text: str) -> None:
+        # appendPlainText 在视图位于底部时会自动滚动，无需再移动光标触发额外排版
         self.chat_history_view.appendPlainText(text)
-        cursor = self.chat_history_view.textCursor()
-        cursor.movePosition(cursor.End)
-        self.chat_history_view.setTextCursor(cursor)
 
     # ------------------------------------------------------------------ HISTORY & STATUS
     def _show_error(self, message: str) -> None:
@@ -1321,25 +1786,32 @@ class MainWindow(QMainWindow):
     def _set_status(self, message: str, status: str = "info", target: Optional[QLabel] = None) -> None:
         label = target or self.download_status_label
         label.setText(message)
+        # 状态未变化时（如连续的进度消息）无需重新计算样式
+        if label.property("status") == status:
+            return
         label.setProperty("status", status)
         label.style().unpolish(label)
         label.style().polish(label)
 
     def _load_history(self) -> None:
-        if not HISTORY_FILE.exists():
-            self._refresh_history_list()
-            return
-        try:
-            entries = json.loads(HISTORY_FILE.read_text(encoding="utf-8"))
-            self.history = [
-                HistoryItem(**item)
-                for item in entries
-                if isinstance(item, dict) and {"url", "title", "timestamp"} <= item.keys()
-            ]
-            self._refresh_history_list()
-        except Exception:  # noqa: BLE001
-            self.history = []
-            self._refresh_history_list()
+        self._history_loader = HistoryLoader(HISTORY_FILE)
+        self._history_loader.signals.loaded.connect(self._on_history_loaded)
+        QThreadPool.globalInstance().start(self._history_loader)
+
+    @Slot(list)
+    def _on_history_loaded(self, items: list) -> None:
+        self._merge_loaded_history(items)
+        self._refresh_history_list()
+        if self._history_save_pending:
+            self._history_save_pending = False
+            self._flush_history_later()
+
+    def _merge_loaded_history(self, items: List[HistoryItem]) -> None:
+        self._history_loader = None
+        self._history_loaded = True
+        # 加载完成前新增的记录优先保留，文件中的旧记录排在其后
+        known = {item.url for item in self.history}
+        self.history = (self.history + [item for item in items if item.url not in known])[:HISTORY_LIMIT]
 
     def _save_history_entry(self, result: dict) -> None:
         url = self.url_input.text().strip()
@@ -1347,26 +1819,58 @@ class MainWindow(QMainWindow):
         timestamp = result.get("timestamp")
 
         if not timestamp:
-            from datetime import datetime
-
             timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
 
         new_item = HistoryItem(url=url, title=title, timestamp=timestamp)
-        self.history = [item for item in self.history if item.url != url]
+        # 增量更新列表控件：移除重复项、插入到顶部、淘汰超出上限的旧项
+        for row, item in enumerate(self.history):
+            if item.url == url:
+                del self.history[row]
+                self.history_list.takeItem(row)
+                break
         self.history.insert(0, new_item)
-        self.history = self.history[:20]
+        self.history_list.insertItem(0, self._make_history_list_item(new_item))
+        while len(self.history) > HISTORY_LIMIT:
+            self.history.pop()
+            self.history_list.takeItem(HISTORY_LIMIT)
 
-        self._refresh_history_list()
-        data = [item.__dict__ for item in self.history]
-        HISTORY_FILE.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+        self._flush_history_later()
+
+    def _flush_history_later(self) -> None:
+        # 合并短时间内的多次修改，只写一次文件
+        if not self._history_save_pending:
+            self._history_save_pending = True
+            QTimer.singleShot(500, self._flush_history_if_pending)
+
+    def _flush_history_if_pending(self, blocking: bool = False) -> None:
+        if not self._history_save_pending:
+            return
+        if not self._history_loaded:
+            # 历史文件尚未读完时不能直接写入，否则会覆盖旧记录；加载完成后会重新调度
+            if not blocking:
+                return
+            # 窗口关闭时仍未读完：同步读取文件并合并，避免丢失本次会话新增的记录
+            if self._history_loader is not None:
+                self._history_loader.signals.loaded.disconnect(self._on_history_loaded)
+            self._merge_loaded_history(_read_history_file(HISTORY_FILE))
+        self._history_save_pending = False
+        data = [asdict(item) for item in self.history]
+        if blocking:
+            self._history_io_pool.waitForDone()
+            _write_history_file(HISTORY_FILE, data)
+        else:
+            self._history_io_pool.start(HistoryWriter(HISTORY_FILE, data))
+
+    @staticmethod
+    def _make_history_list_item(item: HistoryItem) -> QListWidgetItem:
+        list_item = QListWidgetItem(f"{item.title} — {item.timestamp}")
+        list_item.setData(Qt.ItemDataRole.UserRole, item.url)
+        return list_item
 
     def _refresh_history_list(self) -> None:
         self.history_list.clear()
         for item in self.history:
-            display = f"{item.title} — {item.timestamp}"
-            list_item = QListWidgetItem(display)
-            list_item.setData(Qt.ItemDataRole.UserRole, item.url)
-            self.history_list.addItem(list_item)
+            self.history_list.addItem(self._make_history_list_item(item))
 
     # ------------------------------------------------------------------ LIFECYCLE
     def closeEvent(self, event) -> None:  # noqa: N802
@@ -1382,17 +1886,27 @@ class MainWindow(QMainWindow):
             self.transcribe_worker.error.disconnect()
             self.transcribe_worker.quit()
             self.transcribe_worker.wait(2000)
+        if self.chat_worker and self.chat_worker.isRunning():
+            self.chat_worker.partial.disconnect()
+            self.chat_worker.finished.disconnect()
+            self.chat_worker.error.disconnect()
+            self.chat_worker.quit()
+            self.chat_worker.wait(2000)
         if self.chat_batch_worker and self.chat_batch_worker.isRunning():
             self.chat_batch_worker.progress.disconnect()
             self.chat_batch_worker.finished.disconnect()
             self.chat_batch_worker.error.disconnect()
             self.chat_batch_worker.quit()
             self.chat_batch_worker.wait(2000)
+        # 退出前同步写入，并等待后台写入完成
+        self._flush_history_if_pending(blocking=True)
+        self._history_io_pool.waitForDone(2000)
         super().closeEvent(event)
 
 
 def run_app() -> None:
     app = QApplication(sys.argv)
+    app.setStyleSheet(_STYLESHEET)
     window = MainWindow()
     window.show()
     sys.exit(app.exec())
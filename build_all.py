@@ -5,6 +5,7 @@
 
 from __future__ import annotations
 
+import argparse
 import platform
 import shutil
 import subprocess
@@ -12,10 +13,31 @@ import sys
 from pathlib import Path
 
 APP_NAME = "AI_Audio2Note"
+# 当前解释器路径只解析一次，供 pip 与 PyInstaller 子进程共用
+PYEXE = sys.executable
+
+# 运行时用不到的标准库/工具包，排除后分发包更小、启动时需扫描的冻结模块更少。
+# unittest、setuptools、distutils 会被 numpy 等依赖间接引用，故保留。
+EXCLUDED_MODULES = [
+    "tkinter",
+    "test",
+    "lib2to3",
+    "pydoc_data",
+    "pip",
+    "xmlrpc",
+]
 
 
 class DesktopBuilder:
-    def __init__(self) -> None:
+    def __init__(self, onefile: bool = False) -> None:
+        # 默认 onedir：onefile 每次启动都要先解压到临时目录，启动明显更慢
+        self.onefile = onefile
+        # 平台信息在构建过程中不会变化，只探测一次
+        raw_system = platform.system()
+        self.system = raw_system.lower()
+        mapping = {"windows": "Windows", "darwin": "macOS", "linux": "Linux"}
+        self.platform_label = mapping.get(self.system, raw_system)
+        self.executable_name = f"{APP_NAME}.exe" if self.system == "windows" else APP_NAME
         self.project_root = Path(__file__).parent.resolve()
         self.dist_root = self.project_root / "dist"
         self.binary_dir = self.dist_root / "bin"
@@ -23,21 +45,6 @@ class DesktopBuilder:
         self.bundle_dir = self.dist_root / f"{APP_NAME}_{self.platform_label}"
         self._artifact_path: Path | None = None
 
-    @property
-    def system(self) -> str:
-        return platform.system().lower()
-
-    @property
-    def platform_label(self) -> str:
-        mapping = {"windows": "Windows", "darwin": "macOS", "linux": "Linux"}
-        return mapping.get(self.system, platform.system())
-
-    @property
-    def executable_name(self) -> str:
-        if self.system == "windows":
-            return f"{APP_NAME}.exe"
-        return APP_NAME
-
     def ensure_dependencies(self) -> None:
         try:
             import PyInstaller  # noqa: F401
@@ -45,7 +52,7 @@ class DesktopBuilder:
             print("✅ PyInstaller 已安装")
         except ImportError:
             print("📦 未检测到 PyInstaller，正在安装...")
-            subprocess.run([sys.executable, "-m", "pip", "install", "pyinstaller"], check=True)
+            subprocess.run([PYEXE, "-m", "pip", "install", "pyinstaller"], check=True)
 
     def clean_previous_builds(self) -> None:
         for path in (self.binary_dir, self.work_dir, self.bundle_dir):
@@ -57,7 +64,7 @@ class DesktopBuilder:
     def build_binary(self) -> None:
         print("🔨 正在构建桌面端可执行文件...")
         cmd = [
-            sys.executable,
+            PYEXE,
             "-m",
             "PyInstaller",
             "--noconfirm",
@@ -82,13 +89,17 @@ class DesktopBuilder:
         ]
         for hidden in hidden_imports:
             cmd.extend(["--hidden-import", hidden])
+        for module in EXCLUDED_MODULES:
+            cmd.extend(["--exclude-module", module])
+        # faster_whisper 的子模块、VAD 模型等数据由 hooks/hook-faster_whisper.py 统一收集
+        cmd.extend(["--additional-hooks-dir", "hooks"])
 
-        if self.system == "windows":
-            cmd.extend(["--onefile", "--windowed"])
-        elif self.system == "darwin":
+        if self.system in ("windows", "darwin"):
             cmd.append("--windowed")
-        else:
+        if self.onefile and self.system != "darwin":
             cmd.append("--onefile")
+        else:
+            cmd.append("--onedir")
 
         cmd.append("start_native.py")
 
@@ -100,12 +111,21 @@ class DesktopBuilder:
         print(f"✅ 可执行文件构建完成: {artifact}")
 
     def expected_artifact(self) -> Path:
-        if self.system == "windows":
-            return self.binary_dir / f"{APP_NAME}.exe"
         if self.system == "darwin":
             return self.binary_dir / f"{APP_NAME}.app"
+        if self.onefile:
+            return self.binary_dir / self.executable_name
+        # onedir 产物是包含可执行文件与依赖的目录
         return self.binary_dir / APP_NAME
 
+    @property
+    def launch_path(self) -> str:
+        """启动脚本中相对于分发包根目录的可执行文件路径。"""
+        if self.onefile:
+            return self.executable_name
+        separator = "\\" if self.system == "windows" else "/"
+        return f"{APP_NAME}{separator}{self.executable_name}"
+
     def assemble_bundle(self) -> None:
         print("📦 正在整理分发包...")
         if not self._artifact_path:
@@ -142,7 +162,7 @@ class DesktopBuilder:
 setlocal
 pushd %~dp0
 echo 启动 AI Audio2Note...
-start "" "{self.executable_name}"
+start "" "{self.launch_path}"
 popd
 """,
             encoding="utf-8",
@@ -166,7 +186,7 @@ open "$DIR/{app_path.name}"
             f"""#!/bin/bash
 DIR="$(cd "$(dirname "$0")" && pwd)"
 echo "启动 AI Audio2Note..."
-"$DIR/{APP_NAME}"
+"$DIR/{self.launch_path}"
 """,
             encoding="utf-8",
         )
@@ -183,7 +203,15 @@ echo "启动 AI Audio2Note..."
 
 
 def main() -> None:
-    builder = DesktopBuilder()
+    parser = argparse.ArgumentParser(description="构建 AI Audio2Note 桌面端分发包")
+    parser.add_argument(
+        "--onefile",
+        action="store_true",
+        help="打包为单个可执行文件（启动时需解压，较慢；默认生成目录形式）",
+    )
+    args = parser.parse_args()
+
+    builder = DesktopBuilder(onefile=args.onefile)
     builder.build()
 
 
@@ -5,7 +5,7 @@
 
 from __future__ import annotations
 
-import subprocess
+import os
 import sys
 from pathlib import Path
 
@@ -15,37 +15,27 @@ def main() -> None:
     dist_dir = project_root / "dist" / "debug"
     work_dir = project_root / "dist" / "debug_build"
 
-    cmd = [
-        sys.executable,
-        "-m",
-        "PyInstaller",
+    try:
+        # 在当前进程内调用 PyInstaller，省去再启动一个 Python 解释器
+        import PyInstaller.__main__ as pyinstaller
+    except ImportError:
+        sys.exit("❌ 未检测到 PyInstaller，请先运行: pip install pyinstaller")
+
+    # spec 中的相对路径（pathex 与入口脚本）均以项目根目录为准
+    os.chdir(project_root)
+
+    # 构建配置固定在 spec 文件中，PyInstaller 无需每次由命令行参数重新生成
+    args = [
         "--noconfirm",
-        "--onedir",
-        "--paths",
-        ".",
-        "--name",
-        "AI_Audio2Note_Debug",
         "--distpath",
         str(dist_dir),
         "--workpath",
         str(work_dir),
-        "--hidden-import",
-        "ai_audio2note.backend.services.audio_downloader",
-        "--hidden-import",
-        "ai_audio2note.backend.services.process_service",
-        "--hidden-import",
-        "ai_audio2note.backend.services.transcription_service",
-        "--hidden-import",
-        "faster_whisper",
-        "--hidden-import",
-        "ai_audio2note.backend.services.chat_service",
-        "--hidden-import",
-        "requests",
-        "start_native.py",
+        "AI_Audio2Note_Debug.spec",
     ]
 
     print("🚀 开始快速构建 (onedir)...")
-    subprocess.run(cmd, check=True, cwd=project_root)
+    pyinstaller.run(args)
     print(f"✅ 调试版本已生成，位置：{dist_dir}")
 
 
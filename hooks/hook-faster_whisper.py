@@ -0,0 +1,7 @@
+"""
+PyInstaller hook：完整收集 faster_whisper 的子模块、数据文件（如 VAD 模型）与二进制依赖。
+"""
+
+from PyInstaller.utils.hooks import collect_all
+
+datas, binaries, hiddenimports = collect_all("faster_whisper")
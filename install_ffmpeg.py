@@ -4,108 +4,162 @@ FFmpeg 自动安装脚本
 为没有代码基础的用户提供FFmpeg安装帮助
 """
 
-import os
 import sys
-import platform
+from functools import lru_cache
+import shutil
 import subprocess
-import webbrowser
-from pathlib import Path
 
+# 各平台安装指导整段输出，每个指导只写一次终端
+WINDOWS_GUIDE = f"""\
+🪟 Windows FFmpeg 安装指导
+{"=" * 50}
+方法1: 使用Chocolatey (推荐)
+1. 打开PowerShell (管理员权限)
+2. 运行: Set-ExecutionPolicy Bypass -Scope Process -Force; [System.Net.ServicePointManager]::SecurityProtocol = [System.Net.ServicePointManager]::SecurityProtocol -bor 3072; iex ((New-Object System.Net.WebClient).DownloadString('https://community.chocolatey.org/install.ps1'))
+3. 运行: choco install ffmpeg
+
+方法2: 手动安装
+1. 访问: https://ffmpeg.org/download.html
+2. 下载Windows版本
+3. 解压到 C:\\ffmpeg
+4. 添加 C:\\ffmpeg\\bin 到系统PATH
+
+"""
+
+MAC_GUIDE = f"""\
+🍎 macOS FFmpeg 安装指导
+{"=" * 50}
+方法1: 使用Homebrew (推荐)
+1. 安装Homebrew (如果未安装):
+   /bin/bash -c "$(curl -fsSL https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)"
+2. 安装FFmpeg:
+   brew install ffmpeg
+
+方法2: 使用MacPorts
+1. 安装MacPorts: https://www.macports.org/install.php
+2. 运行: sudo port install ffmpeg
+
+"""
+
+LINUX_GUIDE = f"""\
+🐧 Linux FFmpeg 安装指导
+{"=" * 50}
+Ubuntu/Debian:
+sudo apt update
+sudo apt install ffmpeg
+
+CentOS/RHEL:
+sudo yum install ffmpeg
+
+Fedora:
+sudo dnf install ffmpeg
+
+Arch Linux:
+sudo pacman -S ffmpeg
+
+"""
+
+@lru_cache(maxsize=1)
 def check_ffmpeg():
-    """检查FFmpeg是否已安装"""
+    """检查FFmpeg是否已安装（结果在进程内缓存，安装后用 check_ffmpeg.cache_clear() 重新检测）"""
+    # 先在 PATH 中查找，未找到时无需启动任何子进程
+    ffmpeg_path = shutil.which("ffmpeg")
+    if ffmpeg_path is None:
+        print("❌ FFmpeg 未安装")
+        return False
+
+    # 使用解析后的绝对路径，避免子进程再次搜索 PATH；版本号只在首行，读完即关闭管道
     try:
-        result = subprocess.run(["ffmpeg", "-version"], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ FFmpeg 已安装")
-            print(f"版本信息: {result.stdout.split('ffmpeg version')[1].split()[0]}")
-            return True
-    except FileNotFoundError:
-        pass
-    
-    print("❌ FFmpeg 未安装")
-    return False
+        proc = subprocess.Popen(
+            [ffmpeg_path, "-version"],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            text=True,
+            errors="replace",
+        )
+    except OSError:
+        print(f"❌ FFmpeg 无法运行: {ffmpeg_path}")
+        return False
+    first_line = proc.stdout.readline()
+    proc.stdout.close()
+    try:
+        proc.wait(timeout=1)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+        proc.wait()
+    # 提前关闭管道后退出码可能因 SIGPIPE 非零，因此以首行输出判断是否为可用的 ffmpeg
+    if not first_line.startswith("ffmpeg version"):
+        print(f"❌ FFmpeg 无法正常运行: {ffmpeg_path}")
+        return False
+
+    print("✅ FFmpeg 已安装")
+    version = first_line.partition("ffmpeg version ")[2].split(None, 1)
+    if version:
+        print(f"版本信息: {version[0]}")
+    return True
 
 def install_ffmpeg_windows():
     """Windows FFmpeg安装指导"""
-    print("🪟 Windows FFmpeg 安装指导")
-    print("=" * 50)
-    
-    print("方法1: 使用Chocolatey (推荐)")
-    print("1. 打开PowerShell (管理员权限)")
-    print("2. 运行: Set-ExecutionPolicy Bypass -Scope Process -Force; [System.Net.ServicePointManager]::SecurityProtocol = [System.Net.ServicePointManager]::SecurityProtocol -bor 3072; iex ((New-Object System.Net.WebClient).DownloadString('https://community.chocolatey.org/install.ps1'))")
-    print("3. 运行: choco install ffmpeg")
-    print()
-    
-    print("方法2: 手动安装")
-    print("1. 访问: https://ffmpeg.org/download.html")
-    print("2. 下载Windows版本")
-    print("3. 解压到 C:\\ffmpeg")
-    print("4. 添加 C:\\ffmpeg\\bin 到系统PATH")
-    print()
-    
-    # 尝试自动打开下载页面
+    sys.stdout.write(WINDOWS_GUIDE)
+    sys.stdout.flush()
+
+    # 尝试自动打开下载页面（仅 Windows 用到 webbrowser，在此处才导入）
+    import webbrowser
+
     try:
-        webbrowser.open("https://ffmpeg.org/download.html")
-        print("🌐 已自动打开FFmpeg下载页面")
-    except:
+        if webbrowser.open("https://ffmpeg.org/download.html", new=2, autoraise=False):
+            print("🌐 已自动打开FFmpeg下载页面")
+    except webbrowser.Error:
         pass
+    return False
 
 def install_ffmpeg_mac():
     """macOS FFmpeg安装指导"""
-    print("🍎 macOS FFmpeg 安装指导")
-    print("=" * 50)
-    
-    print("方法1: 使用Homebrew (推荐)")
-    print("1. 安装Homebrew (如果未安装):")
-    print("   /bin/bash -c \"$(curl -fsSL https://raw.githubusercontent.com/Homebrew/install/HEAD/install.sh)\"")
-    print("2. 安装FFmpeg:")
-    print("   brew install ffmpeg")
-    print()
-    
-    print("方法2: 使用MacPorts")
-    print("1. 安装MacPorts: https://www.macports.org/install.php")
-    print("2. 运行: sudo port install ffmpeg")
-    print()
-    
-    # 检查是否有Homebrew
-    try:
-        result = subprocess.run(["brew", "--version"], capture_output=True, text=True)
-        if result.returncode == 0:
-            print("✅ 检测到Homebrew，正在安装FFmpeg...")
-            try:
-                subprocess.run(["brew", "install", "ffmpeg"], check=True)
-                print("✅ FFmpeg 安装成功！")
-                return True
-            except subprocess.CalledProcessError:
-                print("❌ 自动安装失败，请手动安装")
-        else:
-            print("❌ 未检测到Homebrew")
-    except FileNotFoundError:
+    sys.stdout.write(MAC_GUIDE)
+    sys.stdout.flush()
+
+    # 检查是否有Homebrew：直接在 PATH 中查找，避免启动 brew 自身的 Ruby 运行时
+    brew = shutil.which("brew")
+    if brew is None:
         print("❌ 未检测到Homebrew")
-    
-    return False
+        return False
+
+    # 先刷新输出，避免与 brew 子进程的输出交错
+    print("✅ 检测到Homebrew，正在安装FFmpeg...", flush=True)
+    try:
+        subprocess.run([brew, "install", "ffmpeg"], check=True)
+    except subprocess.CalledProcessError:
+        print("❌ 自动安装失败，请手动安装")
+        return False
+
+    # 在当前进程内直接复检，无需用户重新运行脚本
+    check_ffmpeg.cache_clear()
+    if not check_ffmpeg():
+        print("⚠️ 安装命令已完成，但未在 PATH 中找到 ffmpeg，请重新打开终端后再试")
+        return False
+    print("🎉 已完成，可直接使用 AI Audio2Note")
+    return True
 
 def install_ffmpeg_linux():
     """Linux FFmpeg安装指导"""
-    print("🐧 Linux FFmpeg 安装指导")
-    print("=" * 50)
-    
-    print("Ubuntu/Debian:")
-    print("sudo apt update")
-    print("sudo apt install ffmpeg")
-    print()
-    
-    print("CentOS/RHEL:")
-    print("sudo yum install ffmpeg")
-    print()
-    
-    print("Fedora:")
-    print("sudo dnf install ffmpeg")
-    print()
-    
-    print("Arch Linux:")
-    print("sudo pacman -S ffmpeg")
-    print()
+    sys.stdout.write(LINUX_GUIDE)
+    sys.stdout.flush()
+    return False
+
+def _system_name():
+    """由 sys.platform 得到系统名称；sys.platform 是启动时确定的常量，无需导入 platform 模块"""
+    if sys.platform.startswith("win"):
+        return "windows"
+    if sys.platform.startswith("linux"):
+        return "linux"
+    return sys.platform
+
+# 按操作系统分派安装流程；返回 True 表示已自动安装，False 表示需按指导手动安装
+_INSTALLERS = {
+    "windows": install_ffmpeg_windows,
+    "darwin": install_ffmpeg_mac,
+    "linux": install_ffmpeg_linux,
+}
 
 def main():
     """主函数"""
@@ -121,18 +175,14 @@ def main():
     print("请根据您的操作系统选择安装方法：")
     print()
     
-    system = platform.system().lower()
-    
-    if system == "windows":
-        install_ffmpeg_windows()
-    elif system == "darwin":
-        if not install_ffmpeg_mac():
-            print("请按照上述指导手动安装FFmpeg")
-    elif system == "linux":
-        install_ffmpeg_linux()
-    else:
+    system = _system_name()
+    handler = _INSTALLERS.get(system)
+    if handler is None:
         print(f"❌ 不支持的操作系统: {system}")
         return
+    if handler():
+        return
+    print("请按照上述指导手动安装FFmpeg")
     
     print("\n安装完成后，请重新运行此脚本验证安装。")
     print("或者直接启动AI Audio2Note测试功能。")
@@ -3,12 +3,13 @@
 启动 PySide6 桌面端应用。
 """
 
-from ai_audio2note.gui.app import run_app
-
 
 def main() -> None:
     """入口函数，启动桌面应用。"""
-    print("🎵 正在启动 AI Audio2Note 桌面端...")
+    print("🎵 正在启动 AI Audio2Note 桌面端...", flush=True)
+    # 先给出提示再导入 Qt 及界面模块，导入本身耗时较长
+    from ai_audio2note.gui.app import run_app
+
     run_app()
 
 